@@ -2,17 +2,30 @@ import os
 import re
 import json
 import asyncio
+import heapq
+import math
 import logging
+import time
+import threading
 import importlib.util
 import unicodedata
+import weakref
+import copy
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator, AsyncIterator
 try:
     import tiktoken
 except Exception:
     tiktoken = None
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 try:
     from backend import db_postgres as db
 except ModuleNotFoundError:
@@ -23,13 +36,58 @@ from backend import ranking_scorer
 from backend import voyager
 from backend.disambiguation import detect_option_reference, resolve_candidate_reference, is_probable_disambiguation_followup
 
-_executor = ThreadPoolExecutor(max_workers=4)
+# DB lookups, context building and citation verification run here. The db_postgres
+# pool (10 connections) is shared with the event loop thread and other callers, so a
+# worker may wait in db_postgres.get_db for a free connection rather than fail
+_executor = ThreadPoolExecutor(max_workers=8)
 
 
-async def try_web_search_and_ingest(query: str, conversation_id: Optional[str] = None) -> Dict[str, Any]:
+# Normalized query -> (fetched_at, find_and_prepare_cases result); Tavily is a paid API
+_WEB_SEARCH_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_WEB_SEARCH_LOCKS: Dict[str, asyncio.Lock] = {}
+_WEB_SEARCH_CACHE_TTL = 300.0
+
+async def find_cases_cached(query: str) -> Dict[str, Any]:
+    """web_search.find_and_prepare_cases, memoized per normalized query for a few minutes.
+    
+    A per-key lock makes simultaneous identical queries share one Tavily call.
+    Only successful searches are cached.
+    """
+    key = _WS_RX.sub(' ', query.strip().lower())
+    cached = _WEB_SEARCH_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _WEB_SEARCH_CACHE_TTL:
+        return cached[1]
+    
+    lock = _WEB_SEARCH_LOCKS.setdefault(key, asyncio.Lock())
+    async with lock:
+        cached = _WEB_SEARCH_CACHE.get(key)
+        if cached is not None and time.monotonic() - cached[0] < _WEB_SEARCH_CACHE_TTL:
+            return cached[1]
+        
+        search_result = await web_search.find_and_prepare_cases(
+            query=query,
+            local_results=[],
+            confidence_threshold=0.0
+        )
+        
+        now = time.monotonic()
+        for stale in [k for k, (ts, _) in _WEB_SEARCH_CACHE.items() if now - ts >= _WEB_SEARCH_CACHE_TTL]:
+            del _WEB_SEARCH_CACHE[stale]
+        for idle in [k for k, l in _WEB_SEARCH_LOCKS.items() if k != key and k not in _WEB_SEARCH_CACHE and not l.locked()]:
+            del _WEB_SEARCH_LOCKS[idle]
+        if search_result.get("success"):
+            _WEB_SEARCH_CACHE[key] = (now, search_result)
+        return search_result
+
+async def try_web_search_and_ingest(
+    query: str,
+    conversation_id: Optional[str] = None,
+    search_result: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """
     Attempt to find relevant cases via web search when local results are insufficient.
     If cases are found on CourtListener, ingest them and return new pages.
+    Pass search_result to reuse a find_cases_cached lookup that already ran.
     
     This implements the Search-to-Ingest loop:
     1. Search Tavily for case citations
@@ -40,11 +98,8 @@ async def try_web_search_and_ingest(query: str, conversation_id: Optional[str] =
     """
     try:
         logging.info(f"Starting web search for: {query[:80]}...")
-        search_result = await web_search.find_and_prepare_cases(
-            query=query,
-            local_results=[],
-            confidence_threshold=0.0
-        )
+        if search_result is None:
+            search_result = await find_cases_cached(query)
         
         if not search_result.get("web_search_triggered"):
             return {"web_search_triggered": False}
@@ -113,10 +168,11 @@ async def try_web_search_and_ingest(query: str, conversation_id: Optional[str] =
                     
                     # Poll for ingestion completion with timeout
                     max_wait = 5.0
-                    start_time = asyncio.get_event_loop().time()
+                    loop = asyncio.get_running_loop()
+                    start_time = loop.time()
                     ingestion_verified = False
                     
-                    while (asyncio.get_event_loop().time() - start_time) < max_wait:
+                    while (loop.time() - start_time) < max_wait:
                         doc = db.get_document(doc_id) if doc_id else None
                         if doc and doc.get("ingested"):
                             # Verify we have chunks by document ID (more reliable than name search)
@@ -212,6 +268,45 @@ async def try_web_search_and_ingest(query: str, conversation_id: Optional[str] =
         traceback.print_exc()
         return {"web_search_triggered": False, "error": str(e)}
 
+def start_web_lookup(query: str, retrieval_confidence: str) -> Optional[asyncio.Task]:
+    """Start the web-search case lookup early when weak retrieval makes NOT FOUND likely.
+    
+    Only the find_cases_cached lookup is speculative: it has no side effects, so it
+    can be cancelled when the answer turns out usable, and repeat queries are free.
+    Ingestion waits for web_search_fallback.
+    """
+    if retrieval_confidence != RetrievalConfidence.LOW:
+        return None
+    return asyncio.create_task(find_cases_cached(query))
+
+async def web_search_fallback(
+    query: str,
+    conversation_id: Optional[str] = None,
+    lookup_task: Optional[asyncio.Task] = None
+) -> Dict[str, Any]:
+    """try_web_search_and_ingest, reusing a start_web_lookup task when there is one."""
+    search_result = None
+    if lookup_task is not None:
+        try:
+            search_result = await lookup_task
+        except Exception as e:
+            logging.warning(f"Speculative web lookup failed, searching again: {e}")
+    return await try_web_search_and_ingest(query, conversation_id, search_result=search_result)
+
+# Triggers for each cached definition, listed in priority order (first listed wins)
+LEGAL_DEF_RX = re.compile(
+    r'(?P<alice_mayo>alice|mayo|101)'
+    r'|(?P<obviousness>obvious|103)'
+    r'|(?P<claim_construction>claim construction|phillips)'
+    r'|(?P<willful_infringement>willful|enhanced damages)'
+)
+_LEGAL_DEF_PRIORITY = {name: i for i, name in enumerate(LEGAL_DEF_RX.groupindex)}
+
+def legal_definition_key(query_lower: str) -> Optional[str]:
+    """Return the get_cached_legal_definition key a query triggers, or None."""
+    keys = {m.lastgroup for m in LEGAL_DEF_RX.finditer(query_lower)}
+    return min(keys, key=_LEGAL_DEF_PRIORITY.__getitem__) if keys else None
+
 # LRU Cache for frequently cited legal definitions (bypass DB for common queries)
 @lru_cache(maxsize=50)
 def get_cached_legal_definition(term: str) -> Optional[str]:
@@ -338,13 +433,17 @@ def add_pdf_links_to_sources(sources: List[Dict]) -> List[Dict]:
     return enriched
 
 
+_DOC_TYPE_SUFFIX_RX = re.compile(r'\s*\[(OPINION|ORDER|ERRATA|JUDGMENT|DECISION)\]\s*$', re.IGNORECASE)
+_Q_CITATION_RX = re.compile(r'\[(Q\d+)\]')
+_UNLINKED_NUM_CITATION_RX = re.compile(r'\[(\d+)\](?!\()')
+
+
 def clean_case_name(case_name: str) -> str:
     """Clean case name by removing document type suffixes like [OPINION], [ORDER], etc."""
-    import re
     if not case_name:
         return "Unknown Case"
     # Remove common document type suffixes
-    cleaned = re.sub(r'\s*\[(OPINION|ORDER|ERRATA|JUDGMENT|DECISION)\]\s*$', '', case_name, flags=re.IGNORECASE)
+    cleaned = _DOC_TYPE_SUFFIX_RX.sub('', case_name)
     return cleaned.strip() or "Unknown Case"
 
 
@@ -354,8 +453,6 @@ def make_citations_clickable(answer_markdown: str, quote_registry: Dict[str, Dic
     Format: ([1] *Case Name*) - number is clickable link, case name in italics
     The Q# values are renumbered sequentially starting at 1 for each response.
     """
-    import re
-    
     # Track Q# citations in order of appearance and renumber them
     q_citation_map = {}  # Maps original Q# -> (new_number, case_name, pdf_url)
     citation_counter = [0]  # Use list for closure modification
@@ -393,13 +490,11 @@ def make_citations_clickable(answer_markdown: str, quote_registry: Dict[str, Dic
         return full_ref
     
     # First, replace [Q1], [Q2], [Q120], etc. with clean case name links
-    q_pattern = r'\[(Q\d+)\]'
-    result = re.sub(q_pattern, replace_q_citation, answer_markdown)
+    result = _Q_CITATION_RX.sub(replace_q_citation, answer_markdown)
     
     # Then, replace [1], [2], etc. that aren't already linked
     # Avoid matching already-linked citations by checking for no ( after ]
-    num_pattern = r'\[(\d+)\](?!\()'
-    result = re.sub(num_pattern, replace_numeric_citation, result)
+    result = _UNLINKED_NUM_CITATION_RX.sub(replace_numeric_citation, result)
     
     return result
 
@@ -443,6 +538,50 @@ def standardize_response(response: Dict[str, Any], web_search_result: Optional[D
     
     return response
 
+# Per-page/marker/source samples in the debug payload are diagnostics only;
+# set CHAT_DEBUG_SAMPLES=false to skip building them on every response.
+CHAT_DEBUG_SAMPLES = os.environ.get("CHAT_DEBUG_SAMPLES", "true").lower() == "true"
+
+def _debug_pages_sample(pages: Optional[List[Dict]]) -> List[Dict]:
+    if not CHAT_DEBUG_SAMPLES:
+        return []
+    return [{"opinion_id": p.get("opinion_id"), "case_name": p.get("case_name"), "page_number": p.get("page_number")} for p in (pages or [])[:5]]
+
+def _debug_markers_sample(markers: List[Dict]) -> List[Dict]:
+    if not CHAT_DEBUG_SAMPLES:
+        return []
+    return [{"opinion_id": m.get("opinion_id"), "page_number": m.get("page_number"), "quote_preview": (m.get("quote") or "")[:120], "position": m.get("position")} for m in markers[:10]]
+
+def _debug_sources_sample(sources: List[Dict]) -> List[Dict]:
+    if not CHAT_DEBUG_SAMPLES:
+        return []
+    return [{"sid": s.get("sid"), "opinion_id": s.get("opinion_id"), "page_number": s.get("page_number"), "quote": s.get("quote", "")[:120]} for s in sources[:10]]
+
+def _debug_envelope(branch: str, *, search_query: str = "", search_terms: Optional[List[str]] = None,
+                    pages: Optional[List[Dict]] = None, markers: Optional[List[Dict]] = None,
+                    raw_answer: Optional[str] = None, unsupported_claims: int = 0,
+                    extras: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Debug payload for branches that return without sources (disambiguation, rejection, errors)."""
+    pages = pages or []
+    markers = markers or []
+    debug = {
+        "claims": [],
+        "support_audit": {"total_claims": 0, "supported_claims": 0, "unsupported_claims": unsupported_claims},
+        "search_query": search_query,
+        "search_terms": search_terms if search_terms is not None else [],
+        "pages_count": len(pages),
+        "pages_sample": _debug_pages_sample(pages),
+        "markers_count": len(markers),
+        "markers": _debug_markers_sample(markers),
+        "sources_count": 0,
+        "sources": [],
+        "raw_response": raw_answer,
+        "return_branch": branch,
+    }
+    if extras:
+        debug.update(extras)
+    return debug
+
 AI_BASE_URL = os.environ.get("AI_INTEGRATIONS_OPENAI_BASE_URL")
 AI_API_KEY = os.environ.get("AI_INTEGRATIONS_OPENAI_API_KEY")
 
@@ -458,16 +597,229 @@ def _get_openai_class():
     return OpenAI
 
 
+_openai_client = None
+
 def get_openai_client() -> Optional[Any]:
-    OpenAI = _get_openai_class()
-    if OpenAI is None:
+    """Shared OpenAI client, or None when openai is missing or unconfigured.
+    
+    Created once so its HTTP connection pool (and TLS sessions to the endpoint)
+    is kept warm across requests instead of rebuilt on every call.
+    """
+    global _openai_client
+    if _openai_client is None and AI_BASE_URL and AI_API_KEY:
+        OpenAI = _get_openai_class()
+        if OpenAI is not None:
+            _openai_client = OpenAI(base_url=AI_BASE_URL, api_key=AI_API_KEY)
+    return _openai_client
+
+
+# One client per event loop: the httpx pool's connections belong to the loop that
+# opened them, and eval_runner drives each prompt on its own short-lived loop
+_async_openai_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+def get_async_openai_client() -> Optional[Any]:
+    """AsyncOpenAI client for the running loop, or None when openai is missing or unconfigured.
+    
+    Created once per loop so its HTTP connection pool is reused across requests on
+    the server loop. Calls made through it run on the event loop instead of
+    occupying an _executor thread.
+    """
+    if not (AI_BASE_URL and AI_API_KEY) or _get_openai_class() is None:
         return None
-    if AI_BASE_URL and AI_API_KEY:
-        return OpenAI(base_url=AI_BASE_URL, api_key=AI_API_KEY)
-    return None
+    loop = asyncio.get_running_loop()
+    client = _async_openai_clients.get(loop)
+    if client is None:
+        from openai import AsyncOpenAI
+        client = _async_openai_clients[loop] = AsyncOpenAI(base_url=AI_BASE_URL, api_key=AI_API_KEY)
+    return client
 
 
-def expand_query_with_legal_terms(query: str, client: Optional[Any] = None) -> List[str]:
+class _OpenAIRateLimiter:
+    """Client-side cap on in-flight OpenAI calls plus per-minute request/token budgets.
+    
+    Bursts queue here instead of tripping the provider's 429s. Budgets refill
+    continuously (leaky bucket); a limit of 0 disables that budget. The budgets are
+    process-wide, but the concurrency cap is kept per event loop because an
+    asyncio.Semaphore must not be shared across loops.
+    
+    Only calls made through create_chat_completion and the streaming helpers are
+    counted. _llm_extract_passages_fallback still calls the sync client from
+    _executor threads (via build_context_with_quotes) and bypasses this limiter.
+    """
+    
+    def __init__(self, max_concurrency: int, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.max_concurrency = max_concurrency
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._request_budget = float(requests_per_minute)
+        self._token_budget = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed, self._refilled_at = now - self._refilled_at, now
+        if self.requests_per_minute:
+            self._request_budget = min(float(self.requests_per_minute),
+                                       self._request_budget + elapsed * self.requests_per_minute / 60.0)
+        if self.tokens_per_minute:
+            self._token_budget = min(float(self.tokens_per_minute),
+                                     self._token_budget + elapsed * self.tokens_per_minute / 60.0)
+    
+    async def _take_budget(self, tokens: int):
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)  # an oversized call must not wait forever
+        while True:
+            self._refill()
+            wait = 0.0
+            if self.requests_per_minute and self._request_budget < 1:
+                wait = (1 - self._request_budget) * 60.0 / self.requests_per_minute
+            if self.tokens_per_minute and self._token_budget < tokens:
+                wait = max(wait, (tokens - self._token_budget) * 60.0 / self.tokens_per_minute)
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+        if self.requests_per_minute:
+            self._request_budget -= 1
+        if self.tokens_per_minute:
+            self._token_budget -= tokens
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+    
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0):
+        """Hold one concurrency slot, after charging the call to the per-minute budgets."""
+        async with self._semaphore():
+            await self._take_budget(estimated_tokens)
+            yield
+
+
+def _estimate_request_tokens(kwargs: Dict[str, Any]) -> int:
+    """Rough token cost of a chat completion: prompt chars / 4 plus the completion budget."""
+    prompt_chars = sum(len(m.get("content") or "") for m in kwargs.get("messages") or ())
+    return prompt_chars // 4 + int(kwargs.get("max_tokens") or 0)
+
+
+_OPENAI_LIMITER = _OpenAIRateLimiter(
+    int(os.environ.get("OPENAI_MAX_CONCURRENCY", "16")),
+    requests_per_minute=int(os.environ.get("OPENAI_REQUESTS_PER_MINUTE", "0")),
+    tokens_per_minute=int(os.environ.get("OPENAI_TOKENS_PER_MINUTE", "0")),
+)
+
+
+async def create_chat_completion(client: Any, **kwargs) -> Any:
+    """chat.completions.create on the async client, else on `client` in the executor."""
+    async with _OPENAI_LIMITER.slot(_estimate_request_tokens(kwargs)):
+        async_client = get_async_openai_client()
+        if async_client is not None:
+            return await async_client.chat.completions.create(**kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, lambda: client.chat.completions.create(**kwargs))
+
+
+_NOT_FOUND_PHRASE = "NOT FOUND IN PROVIDED OPINIONS"
+# Case-insensitive sentinel tests that avoid upper()-copying the whole answer
+_NOT_FOUND_RX = re.compile(r'NOT FOUND', re.IGNORECASE)
+_NOT_FOUND_PREFIX_RX = re.compile(r'\s*NOT FOUND', re.IGNORECASE)
+
+
+class _NotFoundCollector:
+    """Accumulates streamed chunks; add() returns True once the answer opens with the refusal."""
+    
+    def __init__(self):
+        self.parts: List[str] = []
+        self.finish_reason: Optional[str] = None
+        self._prefix_checked = False
+    
+    def add(self, chunk: Any) -> bool:
+        if not chunk.choices:
+            return False
+        choice = chunk.choices[0]
+        if choice.delta and choice.delta.content:
+            self.parts.append(choice.delta.content)
+        if choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+        if not self._prefix_checked:
+            head = "".join(self.parts).lstrip()
+            if len(head) >= len(_NOT_FOUND_PHRASE):
+                self._prefix_checked = True
+                if head.upper().startswith(_NOT_FOUND_PHRASE):
+                    self.finish_reason = "not_found"
+                    return True
+        return False
+
+
+def stream_completion_until_not_found(client: Any, **kwargs) -> Tuple[str, Optional[str]]:
+    """Run a streamed chat completion and return (text, finish_reason).
+    
+    An answer that opens with the NOT FOUND refusal is routed to the web-search fallback
+    no matter what follows, so generation is abandoned as soon as the full refusal phrase
+    has arrived (detect_response_issues matches on it); finish_reason is then "not_found".
+    """
+    stream = client.chat.completions.create(stream=True, **kwargs)
+    collector = _NotFoundCollector()
+    try:
+        for chunk in stream:
+            if collector.add(chunk):
+                break
+    finally:
+        stream.close()
+    return "".join(collector.parts), collector.finish_reason
+
+
+async def stream_completion_until_not_found_async(client: Any, **kwargs) -> Tuple[str, Optional[str]]:
+    """stream_completion_until_not_found on the async client, else on `client` in the executor."""
+    async with _OPENAI_LIMITER.slot(_estimate_request_tokens(kwargs)):
+        async_client = get_async_openai_client()
+        if async_client is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_executor, lambda: stream_completion_until_not_found(client, **kwargs))
+        
+        stream = await async_client.chat.completions.create(stream=True, **kwargs)
+        collector = _NotFoundCollector()
+        try:
+            async for chunk in stream:
+                if collector.add(chunk):
+                    break
+        finally:
+            await stream.close()
+        return "".join(collector.parts), collector.finish_reason
+
+
+async def stream_content_deltas(client: Any, **kwargs) -> AsyncIterator[str]:
+    """Yield the text deltas of a streamed chat completion.
+    
+    Uses the async client so a long generation does not hold the event loop; the
+    sync `client` fallback (no AsyncOpenAI available) iterates inline as before.
+    The limiter slot is held until the stream is exhausted or closed.
+    """
+    async with _OPENAI_LIMITER.slot(_estimate_request_tokens(kwargs)):
+        async_client = get_async_openai_client()
+        if async_client is None:
+            stream = client.chat.completions.create(stream=True, **kwargs)
+            try:
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                stream.close()
+            return
+        
+        stream = await async_client.chat.completions.create(stream=True, **kwargs)
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+
+
+async def expand_query_with_legal_terms(query: str, client: Optional[Any] = None) -> List[str]:
     """Use GPT-4o to expand a conceptual query with related legal keywords.
     
     Returns a list of 5 related legal search terms for better FTS matching.
@@ -480,7 +832,8 @@ def expand_query_with_legal_terms(query: str, client: Optional[Any] = None) -> L
         return []
     
     try:
-        response = client.chat.completions.create(
+        response = await create_chat_completion(
+            client,
             model="gpt-4o",
             messages=[
                 {
@@ -512,6 +865,27 @@ Output ONLY the 5 terms, one per line, no numbers or bullets. Keep each term sho
         logging.warning(f"Query expansion failed: {e}")
         return []
 
+
+# normalized query -> expansion terms. Failed expansions (no client, API error)
+# return [] and are not stored, so a transient failure is retried next time.
+_EXPANSION_CACHE: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+_EXPANSION_CACHE_SIZE = 1024
+
+async def expand_query_cached(query: str) -> List[str]:
+    """Memoized expand_query_with_legal_terms keyed by the normalized query."""
+    key = ' '.join(query.lower().split())
+    cached = _EXPANSION_CACHE.get(key)
+    if cached is not None:
+        _EXPANSION_CACHE.move_to_end(key)
+        return list(cached)
+    
+    terms = await expand_query_with_legal_terms(key)
+    if terms:
+        _EXPANSION_CACHE[key] = tuple(terms)
+        if len(_EXPANSION_CACHE) > _EXPANSION_CACHE_SIZE:
+            _EXPANSION_CACHE.popitem(last=False)
+    return terms
+
 SYSTEM_PROMPT = """You are a senior U.S. appellate law clerk and patent litigator assisting with Federal Circuit and district-court patent matters.
 
 Your primary obligation is to provide correct, usable legal doctrine and reasoning.
@@ -944,39 +1318,44 @@ DOCTRINE_KNOWLEDGE_BASE = {
 HOT_TOPICS_2025 = DOCTRINE_KNOWLEDGE_BASE
 
 
+# Query phrases that select a DOCTRINE_KNOWLEDGE_BASE entry for prompt context and the reasoning plan
+DOCTRINE_TRIGGERS = {
+    "obviousness": ['obvious', '103', 'motivation to combine', 'ksr', 'tsm', 'teaching suggestion', 'prima facie'],
+    "secondary_considerations": ['secondary considerations', 'commercial success', 'long-felt need', 'failure of others', 'objective indicia', 'nexus', 'hindsight'],
+    "eligibility": ['101', 'eligible', 'abstract idea', 'alice', 'mayo', 'preemption', 'inventive concept', 'significantly more'],
+    "software_eligibility": ['enfish', 'ddr holdings', 'software eligible', 'software patent', 'computer functionality', 'finjan', 'mcro'],
+    "claim_construction": ['claim construction', 'phillips', 'markman', 'intrinsic evidence', 'extrinsic evidence', 'plain meaning', 'broadest reasonable interpretation', 'bri'],
+    "definiteness": ['definite', 'indefinite', 'nautilus', 'reasonable certainty', 'insolubly ambiguous'],
+    "means_plus_function": ['means-plus-function', 'means plus function', 'williamson', 'nonce word', '112(f)', 'module for', 'mechanism for', 'corresponding structure'],
+    "enablement": ['enablement', 'amgen', 'sanofi', 'wands factors', 'undue experimentation', 'genus claim', 'full scope'],
+    "written_description": ['written description', 'ariad', 'possession', 'representative species', 'structural feature'],
+    "doctrine_of_equivalents": ['doctrine of equivalents', 'equivalents', 'festo', 'prosecution history estoppel', 'function-way-result', 'insubstantial difference', 'warner-jenkinson', 'vitiation'],
+    "design_patents": ['design patent', 'samsung', 'egyptian goddess', 'ordinary observer', 'article of manufacture', '§ 289'],
+    "on_sale_bar": ['on-sale', 'on sale bar', 'pfaff', 'ready for patenting', 'commercial offer', 'helsinn', 'in re rudy'],
+    "preliminary_injunction": ['preliminary injunction', 'ebay', 'mercexchange', 'irreparable harm', 'balance of hardships', 'permanent injunction', 'injunctive relief'],
+    "ptab_review": ['ptab', 'inter partes review', 'ipr', 'arthrex', 'appointments clause', 'apj', 'administrative patent judge', 'final written decision', 'fintiv', 'sas institute'],
+    "divided_infringement": ['divided infringement', 'joint infringement', 'akamai', 'limelight', 'direction or control', 'single-entity', 'attribution'],
+    "venue": ['venue', 'tc heartland', 'heartland', '1400(b)', 'in re cray', 'regular and established', 'place of business'],
+    "patent_exhaustion": ['exhaustion', 'lexmark', 'impression products', 'first sale', 'post-sale', 'mallinckrodt', 'jazz photo', 'conditional licens'],
+    "ai_inventorship": ['ai inventor', 'artificial intelligence inventor', 'thaler', 'dabus', 'ai-generated', 'natural person inventor', 'computer-generated'],
+    "damages": ['damages', 'reasonable royalty', 'georgia-pacific', 'lost profits', 'panduit', 'entire market value', 'apportionment', 'frand'],
+    "willful_infringement": ['willful', 'enhanced damages', 'treble damages', 'halo', 'seagate', 'egregious'],
+    "inequitable_conduct": ['inequitable conduct', 'therasense', 'duty of candor', 'rule 56', 'intent to deceive', 'but-for materiality'],
+}
+
+
+def _match_doctrines(query_lower: str) -> List[str]:
+    """Doctrine keys whose triggers occur in the query, in DOCTRINE_TRIGGERS order."""
+    return [key for key, triggers in DOCTRINE_TRIGGERS.items() if any(t in query_lower for t in triggers)]
+
+
 def _build_doctrine_context_for_prompt(query_lower: str) -> str:
     """
     Match query against doctrine triggers and build a context block for prompt injection.
     Returns a formatted string with framework summaries and mandatory terms-of-art.
     """
-    DOCTRINE_TRIGGERS = {
-        "obviousness": ['obvious', '103', 'motivation to combine', 'ksr', 'tsm', 'teaching suggestion', 'prima facie'],
-        "secondary_considerations": ['secondary considerations', 'commercial success', 'long-felt need', 'failure of others', 'objective indicia', 'nexus', 'hindsight'],
-        "eligibility": ['101', 'eligible', 'abstract idea', 'alice', 'mayo', 'preemption', 'inventive concept', 'significantly more'],
-        "software_eligibility": ['enfish', 'ddr holdings', 'software eligible', 'software patent', 'computer functionality', 'finjan', 'mcro'],
-        "claim_construction": ['claim construction', 'phillips', 'markman', 'intrinsic evidence', 'extrinsic evidence', 'plain meaning', 'broadest reasonable interpretation', 'bri'],
-        "definiteness": ['definite', 'indefinite', 'nautilus', 'reasonable certainty', 'insolubly ambiguous'],
-        "means_plus_function": ['means-plus-function', 'means plus function', 'williamson', 'nonce word', '112(f)', 'module for', 'mechanism for', 'corresponding structure'],
-        "enablement": ['enablement', 'amgen', 'sanofi', 'wands factors', 'undue experimentation', 'genus claim', 'full scope'],
-        "written_description": ['written description', 'ariad', 'possession', 'representative species', 'structural feature'],
-        "doctrine_of_equivalents": ['doctrine of equivalents', 'equivalents', 'festo', 'prosecution history estoppel', 'function-way-result', 'insubstantial difference', 'warner-jenkinson', 'vitiation'],
-        "design_patents": ['design patent', 'samsung', 'egyptian goddess', 'ordinary observer', 'article of manufacture', '§ 289'],
-        "on_sale_bar": ['on-sale', 'on sale bar', 'pfaff', 'ready for patenting', 'commercial offer', 'helsinn', 'in re rudy'],
-        "preliminary_injunction": ['preliminary injunction', 'ebay', 'mercexchange', 'irreparable harm', 'balance of hardships', 'permanent injunction', 'injunctive relief'],
-        "ptab_review": ['ptab', 'inter partes review', 'ipr', 'arthrex', 'appointments clause', 'apj', 'administrative patent judge', 'final written decision', 'fintiv', 'sas institute'],
-        "divided_infringement": ['divided infringement', 'joint infringement', 'akamai', 'limelight', 'direction or control', 'single-entity', 'attribution'],
-        "venue": ['venue', 'tc heartland', 'heartland', '1400(b)', 'in re cray', 'regular and established', 'place of business'],
-        "patent_exhaustion": ['exhaustion', 'lexmark', 'impression products', 'first sale', 'post-sale', 'mallinckrodt', 'jazz photo', 'conditional licens'],
-        "ai_inventorship": ['ai inventor', 'artificial intelligence inventor', 'thaler', 'dabus', 'ai-generated', 'natural person inventor', 'computer-generated'],
-        "damages": ['damages', 'reasonable royalty', 'georgia-pacific', 'lost profits', 'panduit', 'entire market value', 'apportionment', 'frand'],
-        "willful_infringement": ['willful', 'enhanced damages', 'treble damages', 'halo', 'seagate', 'egregious'],
-        "inequitable_conduct": ['inequitable conduct', 'therasense', 'duty of candor', 'rule 56', 'intent to deceive', 'but-for materiality'],
-    }
     
-    matched = []
-    for doctrine_key, triggers in DOCTRINE_TRIGGERS.items():
-        if any(t in query_lower for t in triggers):
-            matched.append(doctrine_key)
+    matched = _match_doctrines(query_lower)
     
     if not matched:
         return ""
@@ -1013,34 +1392,8 @@ def _build_agentic_reasoning_plan(query_lower: str, pages: List[Dict]) -> Dict[s
         "reflection_pass": "pending"
     }
     
-    DOCTRINE_TRIGGERS = {
-        "obviousness": ['obvious', '103', 'motivation to combine', 'ksr', 'tsm', 'teaching suggestion', 'prima facie'],
-        "secondary_considerations": ['secondary considerations', 'commercial success', 'long-felt need', 'failure of others', 'objective indicia', 'nexus', 'hindsight'],
-        "eligibility": ['101', 'eligible', 'abstract idea', 'alice', 'mayo', 'preemption', 'inventive concept', 'significantly more'],
-        "software_eligibility": ['enfish', 'ddr holdings', 'software eligible', 'software patent', 'computer functionality', 'finjan', 'mcro'],
-        "claim_construction": ['claim construction', 'phillips', 'markman', 'intrinsic evidence', 'extrinsic evidence', 'plain meaning', 'broadest reasonable interpretation', 'bri'],
-        "definiteness": ['definite', 'indefinite', 'nautilus', 'reasonable certainty', 'insolubly ambiguous'],
-        "means_plus_function": ['means-plus-function', 'means plus function', 'williamson', 'nonce word', '112(f)', 'module for', 'mechanism for', 'corresponding structure'],
-        "enablement": ['enablement', 'amgen', 'sanofi', 'wands factors', 'undue experimentation', 'genus claim', 'full scope'],
-        "written_description": ['written description', 'ariad', 'possession', 'representative species', 'structural feature'],
-        "doctrine_of_equivalents": ['doctrine of equivalents', 'equivalents', 'festo', 'prosecution history estoppel', 'function-way-result', 'insubstantial difference', 'warner-jenkinson', 'vitiation'],
-        "design_patents": ['design patent', 'samsung', 'egyptian goddess', 'ordinary observer', 'article of manufacture', '§ 289'],
-        "on_sale_bar": ['on-sale', 'on sale bar', 'pfaff', 'ready for patenting', 'commercial offer', 'helsinn', 'in re rudy'],
-        "preliminary_injunction": ['preliminary injunction', 'ebay', 'mercexchange', 'irreparable harm', 'balance of hardships', 'permanent injunction', 'injunctive relief'],
-        "ptab_review": ['ptab', 'inter partes review', 'ipr', 'arthrex', 'appointments clause', 'apj', 'administrative patent judge', 'final written decision', 'fintiv', 'sas institute'],
-        "divided_infringement": ['divided infringement', 'joint infringement', 'akamai', 'limelight', 'direction or control', 'single-entity', 'attribution'],
-        "venue": ['venue', 'tc heartland', 'heartland', '1400(b)', 'in re cray', 'regular and established', 'place of business'],
-        "patent_exhaustion": ['exhaustion', 'lexmark', 'impression products', 'first sale', 'post-sale', 'mallinckrodt', 'jazz photo', 'conditional licens'],
-        "ai_inventorship": ['ai inventor', 'artificial intelligence inventor', 'thaler', 'dabus', 'ai-generated', 'natural person inventor', 'computer-generated'],
-        "damages": ['damages', 'reasonable royalty', 'georgia-pacific', 'lost profits', 'panduit', 'entire market value', 'apportionment', 'frand'],
-        "willful_infringement": ['willful', 'enhanced damages', 'treble damages', 'halo', 'seagate', 'egregious'],
-        "inequitable_conduct": ['inequitable conduct', 'therasense', 'duty of candor', 'rule 56', 'intent to deceive', 'but-for materiality'],
-    }
     
-    matched_doctrines = []
-    for doctrine_key, triggers in DOCTRINE_TRIGGERS.items():
-        if any(t in query_lower for t in triggers):
-            matched_doctrines.append(doctrine_key)
+    matched_doctrines = _match_doctrines(query_lower)
     
     if matched_doctrines:
         primary = matched_doctrines[0]
@@ -1522,27 +1875,73 @@ def count_tokens(text: str) -> int:
     except Exception:
         return len(text) // 4  # Rough fallback
 
+# (max_tokens, ((opinion_id, page_number, hash(text)), ...)) -> built context
+_CONTEXT_CACHE: "OrderedDict[Tuple, str]" = OrderedDict()
+_CONTEXT_CACHE_SIZE = 64
+_CONTEXT_CACHE_LOCK = threading.Lock()  # build_context runs on _executor threads
+
 def build_context(pages: List[Dict], max_tokens: int = 80000) -> str:
     """
     Builds context but STOPS adding excerpts once we hit the token limit.
     Default 80k leaves room for system prompt, history, and response.
-    """
-    context_parts = []
-    current_tokens = 0
     
-    for page in pages:
-        excerpt = f"""
+    Follow-up questions often retrieve the same pages, so results are cached by page
+    identity and text hash; a re-ingested page has new text and misses the cache.
+    """
+    key = (max_tokens, tuple((p['opinion_id'], p['page_number'], hash(p['text'])) for p in pages))
+    with _CONTEXT_CACHE_LOCK:
+        cached = _CONTEXT_CACHE.get(key)
+        if cached is not None:
+            _CONTEXT_CACHE.move_to_end(key)
+            return cached
+    
+    context = _build_context_uncached(pages, max_tokens)
+    with _CONTEXT_CACHE_LOCK:
+        _CONTEXT_CACHE[key] = context
+        if len(_CONTEXT_CACHE) > _CONTEXT_CACHE_SIZE:
+            _CONTEXT_CACHE.popitem(last=False)
+    return context
+
+_EXCERPT_TMPL = """
 --- BEGIN EXCERPT ---
-Opinion ID: {page['opinion_id']}
-Case: {page['case_name']}
-Appeal No: {page['appeal_no']}
-Release Date: {page['release_date']}
-Page: {page['page_number']}
+Opinion ID: {opinion_id}
+Case: {case_name}
+Appeal No: {appeal_no}
+Release Date: {release_date}
+Page: {page_number}
 
-{page['text']}
+{text}
 --- END EXCERPT ---
 """
-        tokens = count_tokens(excerpt)
+
+def _strip_page_artifacts(text: str) -> str:
+    """Drop the PDF boilerplate normalize_for_verification also discards.
+    
+    Filing headers, running heads and page/appeal-number lines cost prompt tokens
+    on every page; since verification strips them from the page too, a quote the
+    model copies from the stripped text still binds.
+    """
+    text = _CAFC_HEADER_RX.sub('', text)
+    text = _RUNNING_HEAD_RX.sub('', text)
+    text = _PAGE_NUMBER_LINE_RX.sub('', text)
+    return _APPEAL_NUMBER_LINE_RX.sub('', text)
+
+@lru_cache(maxsize=1024)
+def _page_excerpt(opinion_id: str, case_name: str, appeal_no: str, release_date: str,
+                  page_number: int, text: str) -> Tuple[str, int]:
+    """Formatted excerpt and its token count, shared by contexts that overlap on this page."""
+    excerpt = _EXCERPT_TMPL.format(opinion_id=opinion_id, case_name=case_name, appeal_no=appeal_no,
+                                   release_date=release_date, page_number=page_number,
+                                   text=_strip_page_artifacts(text))
+    return excerpt, count_tokens(excerpt)
+
+def _build_context_uncached(pages: List[Dict], max_tokens: int) -> str:
+    context_parts = []
+    current_tokens = 0
+    
+    for page in pages:
+        excerpt, tokens = _page_excerpt(page['opinion_id'], page['case_name'], page['appeal_no'],
+                                        page['release_date'], page['page_number'], page['text'])
         
         # If adding this would exceed our budget, stop immediately
         if current_tokens + tokens > max_tokens:
@@ -1555,6 +1954,36 @@ Page: {page['page_number']}
     logging.info(f"Built context with {len(context_parts)} pages, {current_tokens} tokens")
     return "\n".join(context_parts)
 
+# normalize_for_verification patterns, in the order they are applied
+_HYPHEN_JOIN_RX = re.compile(r'(\w)-\s*\n\s*(\w)')
+_HYPHEN_NEWLINE_RX = re.compile(r'-\s*\n\s*')
+_HYPHEN_SPACES_RX = re.compile(r'-\s{2,}')
+_CAFC_HEADER_RX = re.compile(r'Case:\s*\d{4}-\d+\s*Document:\s*\d+\s*Page:\s*\d+\s*Filed:\s*\d{1,2}/\d{1,2}/\d{4}')
+_RUNNING_HEAD_RX = re.compile(r'^[A-Z][A-Z\s\.,]+\sv\.?\s+[A-Z][A-Z\s\.,]+$', re.MULTILINE)
+_PAGE_NUMBER_LINE_RX = re.compile(r'^\s*\d{1,3}\s*$', re.MULTILINE)
+_APPEAL_NUMBER_LINE_RX = re.compile(r'^\s*\d{4}-\d{4}\s*$', re.MULTILINE)
+_WS_RX = re.compile(r'\s+')
+_NON_WORD_RX = re.compile(r'[^\w\s]')
+_ELLIPSIS_SPLIT_RX = re.compile(r'\.{3,}|…')
+
+# Soft hyphen dropped, hyphen/dash variants to '-', guillemets to '"'; none of these touch
+# the \w/\s/'-' characters the hyphenation patterns look at, so one pass up front is safe
+_DASH_QUOTE_TABLE = str.maketrans({
+    '\u00ad': None,
+    '\u2010': '-', '\u2011': '-', '\u2012': '-',
+    '\u2013': '-', '\u2014': '-', '\u2015': '-',
+    '«': '"', '»': '"',
+})
+
+# Common Unicode ligatures and symbols; every key is a single character, so one translate() pass
+_LIGATURE_TABLE = str.maketrans({
+    'ﬁ': 'fi', 'ﬂ': 'fl', 'ﬀ': 'ff', 'ﬃ': 'ffi', 'ﬄ': 'ffl',
+    'æ': 'ae', 'œ': 'oe', 'Æ': 'AE', 'Œ': 'OE',
+    '…': '...', '—': '-', '–': '-',
+    '§': 'section', '¶': 'paragraph'
+})
+
+@lru_cache(maxsize=2048)
 def normalize_for_verification(text: str) -> str:
     """Normalize text for quote verification.
     
@@ -1567,72 +1996,74 @@ def normalize_for_verification(text: str) -> str:
     - Additional OCR error mappings
     - Hyphenated linebreak joining
     """
+    # Most OCR'd page text is pure ASCII; every Unicode-only step is an identity there
+    is_ascii = text.isascii()
+    
     # Step 1: Unicode normalization (handles many ligatures automatically)
-    text = unicodedata.normalize('NFKC', text)
+    if not is_ascii:
+        text = unicodedata.normalize('NFKC', text)
     
-    # Step 2: Normalize line endings
-    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    # Step 2: Normalize line endings (most extracted text has no CR at all)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
     
-    # Step 3: Remove soft hyphens and various dash types
-    text = text.replace('\u00ad', '')  # Soft hyphen
-    text = text.replace('\u2010', '-').replace('\u2011', '-').replace('\u2012', '-')  # Hyphens
-    text = text.replace('\u2013', '-').replace('\u2014', '-').replace('\u2015', '-')  # Dashes
+    # Step 3: Remove soft hyphens, unify dash types, straighten guillemets
+    if not is_ascii:
+        text = text.translate(_DASH_QUOTE_TABLE)
     
     # Step 4: Handle hyphenation at line breaks (e.g., "Al-\nice" -> "Alice")
-    text = re.sub(r'(\w)-\s*\n\s*(\w)', r'\1\2', text)  # Join hyphenated words across lines
-    text = re.sub(r'-\s*\n\s*', '', text)  # Hyphen followed by newline
-    text = re.sub(r'-\s{2,}', '', text)     # Hyphen followed by multiple spaces
+    text = _HYPHEN_JOIN_RX.sub(r'\1\2', text)  # Join hyphenated words across lines
+    text = _HYPHEN_NEWLINE_RX.sub('', text)  # Hyphen followed by newline
+    text = _HYPHEN_SPACES_RX.sub('', text)     # Hyphen followed by multiple spaces
     
-    # Step 5: Normalize quotes and apostrophes
-    text = text.replace('"', '"').replace('"', '"')  # Curly quotes -> straight
-    text = text.replace("'", "'").replace("'", "'")  # Curly apostrophes -> straight
+    # Step 5: Normalize backticks to apostrophes (guillemets are handled in step 3)
     text = text.replace('`', "'")
-    text = text.replace('«', '"').replace('»', '"')  # Guillemets
     
     # Step 6: Remove page header/footer artifacts (extended patterns)
     # CAFC format: "Case: 2020-1234 Document: 69 Page: 12 Filed: 01/15/2021"
-    text = re.sub(r'Case:\s*\d{4}-\d+\s*Document:\s*\d+\s*Page:\s*\d+\s*Filed:\s*\d{1,2}/\d{1,2}/\d{4}', '', text)
+    text = _CAFC_HEADER_RX.sub('', text)
     # Running heads like "GOOGLE LLC v. ORACLE AMERICA, INC."
-    text = re.sub(r'^[A-Z][A-Z\s\.,]+\sv\.?\s+[A-Z][A-Z\s\.,]+$', '', text, flags=re.MULTILINE)
+    text = _RUNNING_HEAD_RX.sub('', text)
     # Page numbers (standalone lines with just numbers)
-    text = re.sub(r'^\s*\d{1,3}\s*$', '', text, flags=re.MULTILINE)
+    text = _PAGE_NUMBER_LINE_RX.sub('', text)
     # Appeal number headers
-    text = re.sub(r'^\s*\d{4}-\d{4}\s*$', '', text, flags=re.MULTILINE)
+    text = _APPEAL_NUMBER_LINE_RX.sub('', text)
     
     # Step 7: Normalize common Unicode ligatures
-    ligature_map = {
-        'ﬁ': 'fi', 'ﬂ': 'fl', 'ﬀ': 'ff', 'ﬃ': 'ffi', 'ﬄ': 'ffl',
-        'æ': 'ae', 'œ': 'oe', 'Æ': 'AE', 'Œ': 'OE',
-        '…': '...', '—': '-', '–': '-',
-        '§': 'section', '¶': 'paragraph'
-    }
-    for lig, replacement in ligature_map.items():
-        text = text.replace(lig, replacement)
+    if not is_ascii:
+        text = text.translate(_LIGATURE_TABLE)
     
-    # Step 8: Normalize whitespace (keep single spaces)
-    text = re.sub(r'\s+', ' ', text)
+    # Steps 8-9: Collapse whitespace runs to single spaces, trim, and lowercase
+    # (str.split() uses the same whitespace set as \s, without the regex engine)
+    text = ' '.join(text.split()).lower()
     
-    # Step 9: Remove leading/trailing whitespace and convert to lowercase
-    text = text.strip().lower()
-    
-    # Step 10: Common OCR error corrections
-    ocr_corrections = {
-        '|': 'l',     # Pipe -> lowercase L
-        'l': 'l',     # Keep L as L
-        '1': 'l',     # 1 sometimes confused with l in certain fonts
-        'rn': 'm',    # Common OCR error: 'rn' -> 'm'
-    }
-    # Only apply non-destructive OCR corrections
+    # Step 10: Common OCR error corrections. Only the non-destructive one is applied;
+    # '1' -> 'l' and 'rn' -> 'm' would corrupt citations and ordinary words.
     text = text.replace('|', 'l')
     
     return text
 
 
+@lru_cache(maxsize=2048)
+def _punct_free_variant(norm_text: str) -> Tuple[str, Tuple[str, ...]]:
+    """Punctuation-free form of normalized text and its words.
+    
+    Like normalize_for_verification this is memoized, so each page is reduced once per
+    request no matter how many quotes are checked against it.
+    """
+    punct_free = _NON_WORD_RX.sub('', norm_text)
+    return punct_free, tuple(punct_free.split())
+
+
+@lru_cache(maxsize=4096)
 def verify_quote_with_normalization_variants(quote: str, page_text: str) -> Tuple[bool, str]:
     """Try multiple normalization strategies to verify quote.
     
     Returns (verified, normalization_used)
     
+    Memoized: the binding strategies re-check the same (quote, page) pairs, and a
+    failing check runs the full word-overlap window each time.
+    
     Enhanced for verification rate improvement:
     - Ellipsis handling: If quote contains "...", verify longest fragment
     - No stitching: Each fragment must match exactly, or mark unverified
@@ -1640,13 +2071,12 @@ def verify_quote_with_normalization_variants(quote: str, page_text: str) -> Tupl
     if len(quote.strip()) < 20:
         return False, "too_short"
     
-    norm_quote = normalize_for_verification(quote)
     norm_page = normalize_for_verification(page_text)
     
     # Strategy 0: Handle ellipsis quotes - require longest fragment to match exactly
     if '...' in quote or '…' in quote:
         # Split on ellipsis patterns
-        fragments = re.split(r'\.{3,}|…', quote)
+        fragments = _ELLIPSIS_SPLIT_RX.split(quote)
         fragments = [f.strip() for f in fragments if f.strip() and len(f.strip()) >= 15]
         
         if fragments:
@@ -1661,27 +2091,40 @@ def verify_quote_with_normalization_variants(quote: str, page_text: str) -> Tupl
                 return False, "ellipsis_no_match"
     
     # Strategy 1: Standard normalization (exact substring match)
+    # (ellipsis quotes returned above, so only now is the whole quote normalized)
+    norm_quote = normalize_for_verification(quote)
     if norm_quote in norm_page:
         return True, "standard"
     
     # Strategy 2: Remove all punctuation for exact match
-    punct_free_quote = re.sub(r'[^\w\s]', '', norm_quote)
-    punct_free_page = re.sub(r'[^\w\s]', '', norm_page)
+    punct_free_quote, quote_words = _punct_free_variant(norm_quote)
+    punct_free_page, page_words = _punct_free_variant(norm_page)
     if len(punct_free_quote) >= 20 and punct_free_quote in punct_free_page:
         return True, "punct_free"
     
     # Strategy 3: Word-based overlap check (for minor OCR differences) - STRICT 95% threshold
-    quote_words = punct_free_quote.split()
-    page_words = punct_free_page.split()
     if len(quote_words) >= 8:  # Increased minimum words for word-overlap
-        # Try sliding window match with stricter threshold
-        for i in range(len(page_words) - len(quote_words) + 1):
-            matches = sum(1 for qw, pw in zip(quote_words, page_words[i:i + len(quote_words)]) if qw == pw)
-            if matches >= len(quote_words) * 0.95:  # Increased from 0.85 to 0.95
+        # Try sliding window match with stricter threshold (0.95, up from 0.85).
+        # A window is abandoned as soon as it has more misses than the threshold allows.
+        n = len(quote_words)
+        max_misses = n - math.ceil(n * 0.95)
+        for i in range(len(page_words) - n + 1):
+            misses = 0
+            for j in range(n):
+                if quote_words[j] != page_words[i + j]:
+                    misses += 1
+                    if misses > max_misses:
+                        break
+            else:
                 return True, "word_overlap"
     
     return False, "failed"
 
+_CASE_NAME_NOISE_RX = re.compile(r'\b(v\.?|vs\.?|llc|inc|corp|co\.|ltd|l\.p\.|lp)\b')
+
+# Every marker compares its claimed case against each retrieved page's case name,
+# and those few names repeat across pages, markers and requests
+@lru_cache(maxsize=1024)
 def normalize_case_name_for_binding(name: str) -> str:
     """Normalize case name for fuzzy binding comparison.
     'Google LLC v. Oracle America, Inc.' -> 'google oracle america'
@@ -1689,9 +2132,9 @@ def normalize_case_name_for_binding(name: str) -> str:
     if not name:
         return ""
     name = name.lower()
-    name = re.sub(r'\b(v\.?|vs\.?|llc|inc|corp|co\.|ltd|l\.p\.|lp)\b', '', name)
-    name = re.sub(r'[^\w\s]', ' ', name)
-    name = re.sub(r'\s+', ' ', name)
+    name = _CASE_NAME_NOISE_RX.sub('', name)
+    name = _NON_WORD_RX.sub(' ', name)
+    name = _WS_RX.sub(' ', name)
     return name.strip()
 
 def verify_quote_strict(quote: str, page_text: str) -> bool:
@@ -1953,7 +2396,7 @@ def extract_quotable_passages(page_text: str, max_passages: int = 5, max_len: in
     # Split into sentences (approximate)
     # Handle common legal abbreviations to avoid false splits
     text = page_text.replace('U.S.C.', 'USC').replace('U.S.', 'US').replace('Inc.', 'Inc').replace('Corp.', 'Corp').replace('No.', 'No').replace('v.', 'v')
-    sentences = re.split(r'(?<=[.!?])\s+(?=[A-Z])', text)
+    sentences = _SENTENCE_SPLIT_RX.split(text)
     
     # Score sentences by legal relevance with enhanced scoring
     scored = []
@@ -2077,7 +2520,7 @@ Appeal No: {page['appeal_no']}
 Release Date: {page['release_date']}
 Page: {page['page_number']}
 
-{page['text']}{quote_section}
+{_strip_page_artifacts(page['text'])}{quote_section}
 --- END EXCERPT ---
 """
         tokens = count_tokens(excerpt)
@@ -2095,44 +2538,43 @@ Page: {page['page_number']}
     logging.info(f"Built context with {len(context_parts)} pages, {current_tokens} tokens, {len(quote_registry)} quotable passages (pruned {pages_pruned})")
     return "\n".join(context_parts), quote_registry
 
+@lru_cache(maxsize=256)
+def _normalized_terms_longest_first(search_terms: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Normalized search terms of 4+ chars, longest first (stable, so ties keep query order)."""
+    norm_terms = [normalize_for_verification(term) for term in search_terms]
+    return tuple(sorted((t for t in norm_terms if len(t) >= 4), key=len, reverse=True))
+
 def find_best_quote_in_page(search_terms: List[str], page_text: str, max_len: int = 300) -> Optional[str]:
     norm_page = normalize_for_verification(page_text)
-    best_start = 0
-    best_score = 0
     
-    for term in search_terms:
-        norm_term = normalize_for_verification(term)
-        if len(norm_term) < 4:
-            continue
+    # The longest matching term wins, so check longest first and stop at the first hit
+    for norm_term in _normalized_terms_longest_first(tuple(search_terms)):
         idx = norm_page.find(norm_term)
         if idx >= 0:
-            start = max(0, idx - 50)
-            end = min(len(page_text), start + max_len)
-            snippet = page_text[start:end].strip()
-            score = len(norm_term)
-            if score > best_score:
-                best_score = score
-                best_start = start
-    
-    if best_score > 0:
-        end = min(len(page_text), best_start + max_len)
-        return page_text[best_start:end].strip()
+            best_start = max(0, idx - 50)
+            end = min(len(page_text), best_start + max_len)
+            return page_text[best_start:end].strip()
     
     return page_text[:max_len].strip() if len(page_text) > 0 else None
 
+_QUOTE_PATTERNS = [re.compile(p, re.IGNORECASE | re.DOTALL) for p in (
+    r'Quote:\s*"([^"]+)"',
+    r'"([^"]{30,})"',
+)]
+
 def extract_quote_from_text(text: str) -> Optional[str]:
-    patterns = [
-        r'Quote:\s*"([^"]+)"',
-        r'Quote:\s*"([^"]+)"',
-        r'"([^"]{30,})"',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+    for pattern in _QUOTE_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(1).strip()
     return None
 
 def try_verify_with_retry(quote: str, pages: List[Dict], search_terms: List[str]) -> Optional[Dict]:
+    """Bind quote to a page, else fall back to the best search-term excerpt of the first usable page.
+    
+    Pages with no search-term hit are deliberately not skipped in the fallback:
+    find_best_quote_in_page then quotes the page's opening text, which still binds.
+    """
     matching_page = find_matching_page_strict(quote, pages)
     if matching_page and matching_page.get('page_number', 0) >= 1:
         return {
@@ -2162,6 +2604,12 @@ def try_verify_with_retry(quote: str, pages: List[Dict], search_terms: List[str]
     
     return None
 
+_CITATION_MAP_RX = re.compile(r'CITATION_MAP:\s*\n?((?:\[\d+\][^\n]+\n?)+)', re.IGNORECASE)
+_CITATION_MAP_LINE_RX = re.compile(r'\[(\d+)\]\s*([^(|]+)(?:\(([^)]+)\))?\s*\|\s*([^|]+)\|\s*"(.+)"')
+_CITE_REF_RX = re.compile(r'\[(\d+)\]')
+_LEGACY_CITE_RX = re.compile(r'<!--CITE:([^|]+)\|(\d+)\|"([^"]+)"-->')
+_DIGITS_RX = re.compile(r'(\d+)')
+
 def extract_cite_markers(response_text: str) -> List[Dict]:
     """Extract citation markers from LLM response.
     
@@ -2177,14 +2625,17 @@ def extract_cite_markers(response_text: str) -> List[Dict]:
     markers = []
     
     # Try new CITATION_MAP format first
-    citation_map_match = re.search(r'CITATION_MAP:\s*\n?((?:\[\d+\][^\n]+\n?)+)', response_text, re.IGNORECASE)
+    citation_map_match = _CITATION_MAP_RX.search(response_text)
     if citation_map_match:
         map_text = citation_map_match.group(1)
+        # First position of each [N] in the whole text, from one scan rather than one per citation
+        ref_positions: Dict[str, int] = {}
+        for ref in _CITE_REF_RX.finditer(response_text):
+            ref_positions.setdefault(ref.group(1), ref.start())
         # Parse each line: [1] case_name (opinion_id) | Page page_number | "quote"
         # Also handles: [1] case_name | Page page_number | "quote" (without opinion_id)
         # Use .+ for quote to handle special characters
-        line_pattern = r'\[(\d+)\]\s*([^(|]+)(?:\(([^)]+)\))?\s*\|\s*([^|]+)\|\s*"(.+)"'
-        for match in re.finditer(line_pattern, map_text):
+        for match in _CITATION_MAP_LINE_RX.finditer(map_text):
             citation_num = int(match.group(1))
             case_name = match.group(2).strip()
             opinion_id = (match.group(3) or "").strip()  # May be empty if not provided
@@ -2192,13 +2643,11 @@ def extract_cite_markers(response_text: str) -> List[Dict]:
             quote = match.group(5).strip()
             
             # Parse page number (could be "page 5", "p. 5", or just "5")
-            page_match = re.search(r'(\d+)', page_str)
+            page_match = _DIGITS_RX.search(page_str)
             page_number = int(page_match.group(1)) if page_match else 1
             
             # Find where [N] appears in the main text to get position
-            cite_ref_pattern = rf'\[{citation_num}\]'
-            ref_match = re.search(cite_ref_pattern, response_text)
-            position = ref_match.start() if ref_match else 0
+            position = ref_positions.get(str(citation_num), 0)
             
             markers.append({
                 "case_name": case_name,
@@ -2211,13 +2660,13 @@ def extract_cite_markers(response_text: str) -> List[Dict]:
         return markers
     
     # Fall back to legacy HTML comment format
-    pattern = r'<!--CITE:([^|]+)\|(\d+)\|"([^"]+)"-->'
-    for match in re.finditer(pattern, response_text):
+    for match in _LEGACY_CITE_RX.finditer(response_text):
         markers.append({
             "opinion_id": match.group(1).strip(),
             "page_number": int(match.group(2)),
             "quote": match.group(3).strip(),
-            "position": match.start()
+            "position": match.start(),
+            "end_position": match.end()
         })
     return markers
 
@@ -2365,9 +2814,17 @@ def build_sources_from_markers(
     for page in pages:
         opinion_id = page.get("opinion_id")
         if opinion_id:
-            if opinion_id not in pages_by_opinion:
-                pages_by_opinion[opinion_id] = []
-            pages_by_opinion[opinion_id].append(page)
+            pages_by_opinion.setdefault(opinion_id, []).append(page)
+
+    # Strategies 1, 1.5 and 3.5 and repeated markers ask for the same
+    # (opinion_id, page) more than once; fetch each from the DB only once per call
+    fetched_pages: Dict[Tuple[str, int], Optional[Dict]] = {}
+
+    def fetch_page(opinion_id: str, page_number: int) -> Optional[Dict]:
+        key = (opinion_id, page_number)
+        if key not in fetched_pages:
+            fetched_pages[key] = db.get_page_text(opinion_id, page_number)
+        return fetched_pages[key]
 
     for marker in markers:
         quote = (marker.get("quote") or "").strip()
@@ -2421,7 +2878,7 @@ def build_sources_from_markers(
             # If not found in context, try DB fetch for specific page
             if not page:
                 try:
-                    fetched = db.get_page_text(claimed_opinion_id, page_num)
+                    fetched = fetch_page(claimed_opinion_id, page_num)
                     if fetched and fetched.get("text"):
                         if verify_quote_strict(quote_to_verify, fetched["text"]):
                             page = fetched
@@ -2452,7 +2909,7 @@ def build_sources_from_markers(
             # Also try DB fetch with verbatim extraction
             if not page:
                 try:
-                    fetched = db.get_page_text(claimed_opinion_id, page_num)
+                    fetched = fetch_page(claimed_opinion_id, page_num)
                     if fetched and fetched.get("text"):
                         verbatim = _extract_verbatim_from_source(quote_to_verify, fetched["text"])
                         if verbatim and verify_quote_strict(verbatim, fetched["text"]):
@@ -2516,7 +2973,7 @@ def build_sources_from_markers(
                 for pn in nearby_pages:
                     if pn < 1:
                         continue
-                    fetched = db.get_page_text(claimed_opinion_id, pn)
+                    fetched = fetch_page(claimed_opinion_id, pn)
                     if fetched and fetched.get("text"):
                         ft = fetched["text"]
                         # Try strict
@@ -2851,6 +3308,9 @@ def compute_citation_tier(binding_method: str, signals: List[str], page: Dict) -
     
     return tier, score
 
+_CITATION_MAP_BLOCK_RX = re.compile(r'\n*CITATION_MAP:\s*\n(?:\[\d+\][^\n]+\n?)+', re.IGNORECASE)
+_LEGACY_CITE_STRIP_RX = re.compile(r'<!--CITE:[^>]+-->')
+
 def build_answer_markdown(response_text: str, markers: List[Dict], position_to_sid: Dict[int, str]) -> str:
     """Convert LLM response to markdown with [1], [2] markers.
     
@@ -2859,26 +3319,46 @@ def build_answer_markdown(response_text: str, markers: List[Dict], position_to_s
     result = response_text
     
     # Remove CITATION_MAP section from output (citations are already inline as [1], [2], etc.)
-    result = re.sub(r'\n*CITATION_MAP:\s*\n(?:\[\d+\][^\n]+\n?)+', '', result, flags=re.IGNORECASE)
-    
-    # Handle legacy HTML comment format
-    sorted_markers = sorted(markers, key=lambda m: m['position'], reverse=True)
-    
-    for marker in sorted_markers:
-        if 'citation_num' not in marker:  # Only for legacy format
-            pattern = f'<!--CITE:{re.escape(marker["opinion_id"])}\\|{marker["page_number"]}\\|"{re.escape(marker["quote"])}"-->'
+    result = _CITATION_MAP_BLOCK_RX.sub('', result)
+    
+    # Handle legacy HTML comment format: splice each comment out at the span
+    # extract_cite_markers recorded. Legacy markers only occur when there is no
+    # CITATION_MAP, so the strip above has not shifted their offsets.
+    legacy_markers = sorted((m for m in markers if 'citation_num' not in m), key=lambda m: m['position'])
+    if legacy_markers:
+        parts = []
+        cursor = 0
+        for marker in legacy_markers:
+            if marker['position'] < cursor:
+                continue
+            parts.append(result[cursor:marker['position']])
             sid = position_to_sid.get(marker['position'])
             if sid:
-                result = re.sub(pattern, f' [{sid}]', result, count=1)
-            else:
-                result = re.sub(pattern, '', result, count=1)
+                parts.append(f' [{sid}]')
+            cursor = marker['end_position']
+        parts.append(result[cursor:])
+        result = "".join(parts)
     
-    # Clean up any remaining legacy markers
-    result = re.sub(r'<!--CITE:[^>]+-->', '', result)
+    # Clean up any remaining (malformed) legacy markers; after the splice this is
+    # almost always a no-op, so skip the regex pass unless one is actually left
+    if "<!--CITE:" in result:
+        result = _LEGACY_CITE_STRIP_RX.sub('', result)
     
     return result.strip()
 
 
+# Patterns that indicate case-attributed statements
+# e.g., "In Alice, the Court held...", "The Alice decision established...", "According to KSR..."
+_CASE_ATTRIBUTION_RXS = [re.compile(p, re.IGNORECASE) for p in (
+    r'\b(In|Under|According to|Per|Following|Applying|Citing|As stated in|As held in)\s+([A-Z][a-zA-Z\-\'\s]+(?:v\.?\s+[A-Z][a-zA-Z\-\'\s]+)?)',
+    r'\b(The\s+)?([A-Z][a-zA-Z\-\']+(?:\s+v\.?\s+[A-Z][a-zA-Z\-\']+)?)\s+(court|Court|decision|case|holding|held|established|ruled|stated|found|concluded)',
+    r'([A-Z][a-zA-Z\-\']+(?:\s+v\.?\s+[A-Z][a-zA-Z\-\']+)?)\s+requires\b',
+    r'([A-Z][a-zA-Z\-\']+(?:\s+v\.?\s+[A-Z][a-zA-Z\-\']+)?)\s+test\b',
+    r'([A-Z][a-zA-Z\-\']+(?:\s+v\.?\s+[A-Z][a-zA-Z\-\']+)?)\s+framework\b',
+)]
+_SENTENCE_SPLIT_RX = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+_HAS_UPPER_RX = re.compile(r'[A-Z]')
+
 def apply_per_statement_provenance_gating(
     answer_markdown: str,
     sources: List[Dict]
@@ -2904,21 +3384,11 @@ def apply_per_statement_provenance_gating(
                     verified_cases[case_name] = []
                 verified_cases[case_name].append(s.get('sid', '?'))
     
-    # Patterns that indicate case-attributed statements
-    # e.g., "In Alice, the Court held...", "The Alice decision established...", "According to KSR..."
-    case_attribution_patterns = [
-        r'\b(In|Under|According to|Per|Following|Applying|Citing|As stated in|As held in)\s+([A-Z][a-zA-Z\-\'\s]+(?:v\.?\s+[A-Z][a-zA-Z\-\'\s]+)?)',
-        r'\b(The\s+)?([A-Z][a-zA-Z\-\']+(?:\s+v\.?\s+[A-Z][a-zA-Z\-\']+)?)\s+(court|Court|decision|case|holding|held|established|ruled|stated|found|concluded)',
-        r'([A-Z][a-zA-Z\-\']+(?:\s+v\.?\s+[A-Z][a-zA-Z\-\']+)?)\s+requires\b',
-        r'([A-Z][a-zA-Z\-\']+(?:\s+v\.?\s+[A-Z][a-zA-Z\-\']+)?)\s+test\b',
-        r'([A-Z][a-zA-Z\-\']+(?:\s+v\.?\s+[A-Z][a-zA-Z\-\']+)?)\s+framework\b',
-    ]
-    
     statement_support = []
     modified_lines = []
     
     # Split into sentences for analysis
-    sentences = re.split(r'(?<=[.!?])\s+(?=[A-Z])', answer_markdown)
+    sentences = _SENTENCE_SPLIT_RX.split(answer_markdown)
     
     for sent_idx, sentence in enumerate(sentences):
         is_supported = True
@@ -2926,7 +3396,7 @@ def apply_per_statement_provenance_gating(
         mentioned_cases = []
         
         # Check for inline citations in this sentence
-        cite_refs = re.findall(r'\[(\d+)\]', sentence)
+        cite_refs = _CITE_REF_RX.findall(sentence)
         for ref in cite_refs:
             # Find the source with this sid
             for s in sources:
@@ -2937,12 +3407,12 @@ def apply_per_statement_provenance_gating(
                     break
         
         # Check for case-attributed statements
-        for pattern in case_attribution_patterns:
-            for match in re.finditer(pattern, sentence, re.IGNORECASE):
+        for pattern in _CASE_ATTRIBUTION_RXS:
+            for match in pattern.finditer(sentence):
                 # Extract the case name from the match
                 case_name = None
                 for group in match.groups():
-                    if group and re.search(r'[A-Z]', group):
+                    if group and _HAS_UPPER_RX.search(group):
                         case_name = group.strip()
                         break
                 
@@ -2993,7 +3463,9 @@ def generate_fallback_response(pages: List[Dict], search_terms: List[str], searc
         if page.get('page_number', 0) < 1:
             continue
         exact_quote = extract_exact_quote_from_page(page['text'], max_len=200)
-        if exact_quote and verify_quote_strict(exact_quote, page['text']):
+        # The quote is a prefix of the page text, so only the strict verifier's
+        # minimum-length rule can reject it; skip the normalize-and-rescan pass
+        if len(exact_quote) >= 20:
             sources.append(normalize_source({
                 "sid": str(i),
                 "opinion_id": page['opinion_id'],
@@ -3009,26 +3481,11 @@ def generate_fallback_response(pages: List[Dict], search_terms: List[str], searc
                 "binding_method": "fallback"
             }))
     
-    pages_sample = [{"opinion_id": p.get("opinion_id"), "case_name": p.get("case_name"), "page_number": p.get("page_number")} for p in pages[:5]]
-    
     if not sources:
         return standardize_response({
             "answer_markdown": "NOT FOUND IN PROVIDED OPINIONS.",
             "sources": [],
-            "debug": {
-                "claims": [],
-                "support_audit": {"total_claims": 0, "supported_claims": 0, "unsupported_claims": 1},
-                "search_query": search_query,
-                "search_terms": search_terms,
-                "pages_count": len(pages),
-                "pages_sample": pages_sample,
-                "markers_count": 0,
-                "markers": [],
-                "sources_count": 0,
-                "sources": [],
-                "raw_response": None,
-                "return_branch": "fallback_no_sources"
-            }
+            "debug": _debug_envelope("fallback_no_sources", search_query=search_query, search_terms=search_terms, pages=pages, unsupported_claims=1)
         })
     
     markers = " ".join([f"[{s['sid']}]" for s in sources])
@@ -3043,16 +3500,22 @@ def generate_fallback_response(pages: List[Dict], search_terms: List[str], searc
             "search_query": search_query,
             "search_terms": search_terms,
             "pages_count": len(pages),
-            "pages_sample": pages_sample,
+            "pages_sample": _debug_pages_sample(pages),
             "markers_count": 0,
             "markers": [],
             "sources_count": len(sources),
-            "sources": [{"sid": s.get("sid"), "opinion_id": s.get("opinion_id"), "page_number": s.get("page_number"), "quote": s.get("quote", "")[:120]} for s in sources[:10]],
+            "sources": _debug_sources_sample(sources),
             "raw_response": None,
             "return_branch": "fallback_with_sources"
         }
     })
 
+def _load_citations(citations: Any) -> Dict:
+    """Parse a stored citations payload, using orjson when it is installed."""
+    if isinstance(citations, (str, bytes)):
+        return orjson.loads(citations) if orjson else json.loads(citations)
+    return citations
+
 def get_previous_action_items(conversation_id: str) -> List[Dict]:
     """Get action items from the most recent disambiguation response in the conversation."""
     if not conversation_id:
@@ -3064,8 +3527,10 @@ def get_previous_action_items(conversation_id: str) -> List[Dict]:
         for msg in reversed(messages):
             if msg.get('role') == 'assistant' and msg.get('citations'):
                 citations = msg.get('citations')
-                if isinstance(citations, str):
-                    citations = json.loads(citations)
+                # Skip the parse entirely when the raw payload cannot contain action items
+                if isinstance(citations, str) and 'action_items' not in citations:
+                    continue
+                citations = _load_citations(citations)
                 action_items = citations.get('action_items', [])
                 if action_items:
                     return action_items
@@ -3073,19 +3538,45 @@ def get_previous_action_items(conversation_id: str) -> List[Dict]:
     except Exception:
         return []
 
+# conversation_id -> (id of newest cited assistant message, resolved case context)
+_CASE_CONTEXT_CACHE: "OrderedDict[str, Tuple[Optional[str], Optional[Dict]]]" = OrderedDict()
+_CASE_CONTEXT_CACHE_SIZE = 2048
+
 def get_previous_case_context(conversation_id: str) -> Optional[Dict]:
-    """Get the case mentioned in the most recent exchange, for pronoun resolution."""
+    """Get the case mentioned in the most recent exchange, for pronoun resolution.
+    
+    Only cited assistant messages affect the result, so it is cached per conversation
+    and reused until a newer cited message appears.
+    """
     if not conversation_id:
         return None
     
+    try:
+        head_id = db.get_latest_cited_message_id(conversation_id)
+    except Exception:
+        return None
+    
+    cached = _CASE_CONTEXT_CACHE.get(conversation_id)
+    if cached is not None and cached[0] == head_id:
+        _CASE_CONTEXT_CACHE.move_to_end(conversation_id)
+        return cached[1]
+    
+    case_context = _find_previous_case_context(conversation_id) if head_id else None
+    _CASE_CONTEXT_CACHE[conversation_id] = (head_id, case_context)
+    if len(_CASE_CONTEXT_CACHE) > _CASE_CONTEXT_CACHE_SIZE:
+        _CASE_CONTEXT_CACHE.popitem(last=False)
+    return case_context
+
+def _find_previous_case_context(conversation_id: str) -> Optional[Dict]:
     try:
         messages = db.get_messages(conversation_id)
         # Look for the most recent assistant message with sources
         for msg in reversed(messages):
             if msg.get('role') == 'assistant' and msg.get('citations'):
                 citations = msg.get('citations')
-                if isinstance(citations, str):
-                    citations = json.loads(citations)
+                if isinstance(citations, str) and 'sources' not in citations and 'action_items' not in citations:
+                    continue
+                citations = _load_citations(citations)
                 
                 # Check for sources array
                 sources = citations.get('sources', [])
@@ -3126,15 +3617,16 @@ def get_previous_case_context(conversation_id: str) -> Optional[Dict]:
     except Exception:
         return None
 
-def has_pronoun_reference(message: str) -> bool:
-    """Check if message contains pronouns that likely refer to a previous case."""
-    pronouns = [
-        r'\bits\b', r'\bthis case\b', r'\bthat case\b', r'\bthe case\b',
-        r'\bthe opinion\b', r'\bthis opinion\b', r'\bthat opinion\b',
-        r'\bthe holding\b', r'\bthe ruling\b', r'\bthe decision\b'
-    ]
-    msg_lower = message.lower()
-    return any(re.search(p, msg_lower) for p in pronouns)
+_PRONOUN_REFERENCE_RX = re.compile('|'.join((
+    r'\bits\b', r'\bthis case\b', r'\bthat case\b', r'\bthe case\b',
+    r'\bthe opinion\b', r'\bthis opinion\b', r'\bthat opinion\b',
+    r'\bthe holding\b', r'\bthe ruling\b', r'\bthe decision\b'
+)))
+
+
+def has_pronoun_reference(msg_lower: str) -> bool:
+    """Check if an already-lowercased message contains pronouns that likely refer to a previous case."""
+    return _PRONOUN_REFERENCE_RX.search(msg_lower) is not None
 
 def curate_sources_for_mode(sources: List[Dict], attorney_mode: bool) -> List[Dict]:
     """Filter and prioritize sources by confidence and relevance for response mode."""
@@ -3188,7 +3680,168 @@ def append_citation_appendix(answer_markdown: str, sources: List[Dict]) -> str:
     return answer_markdown.rstrip() + "\n" + "\n".join(appendix_parts)
 
 
+# Query tokenization for the manual FTS fallback in generate_chat_response
+_PUNCT_TABLE = str.maketrans({c: ' ' for c in '§?!.,;:\'"()[]{}'})
+_PUNCT_DEL = str.maketrans('', '', '.,')
+
+_STOPWORDS = frozenset({'the', 'a', 'an', 'is', 'are', 'was', 'were', 'in', 'from', 'to', 'of', 'for', 
+                       'on', 'at', 'by', 'with', 'it', 'its', 'this', 'that', 'be', 'been', 'being',
+                       'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
+                       'may', 'might', 'must', 'shall', 'can', 'and', 'or', 'but', 'if', 'when',
+                       'what', 'how', 'why', 'where', 'which', 'who', 'whom', 'whose', 'than', 'then',
+                       'so', 'as', 'not', 'no', 'yes', 'about', 'into', 'through', 'during', 'before',
+                       'after', 'above', 'below', 'between', 'under', 'again', 'further', 'once',
+                       'here', 'there', 'all', 'each', 'few', 'more', 'most', 'other', 'some', 'such',
+                       'only', 'own', 'same', 'too', 'very', 'just', 'also', 'now', 'even', 'still',
+                       'already', 'always', 'never', 'ever', 'often', 'sometimes', 'usually'})
+
+# Domain-specific search terms added when the query mentions any of the trigger keywords
+_DOMAIN_EXPANSIONS = (
+    (('reissue', '251'), ('reissue', 'recapture', 'broadening', 'broaden', 'enlarge', 'scope', 'original')),
+    (('claim',), ('claim', 'claims', 'limitation', 'element')),
+    (('patent', 'prior art'), ('patent', 'obviousness', 'anticipation', 'novelty', 'prior')),
+    (('infringement',), ('infringement', 'infringe', 'infringes', 'literal', 'doctrine', 'equivalents')),
+    (('alice', 'mayo', 'eligibility', '101'), ('alice', 'mayo', 'eligibility', 'abstract', 'idea', 'ineligible', 'section', 'step')),
+)
+
+# One scan over the query finds every trigger keyword (substring match, like the `in` checks it replaces)
+_DOMAIN_KEYWORD_RE = re.compile('|'.join(
+    re.escape(kw) for kw in sorted({kw for kws, _ in _DOMAIN_EXPANSIONS for kw in kws}, key=len, reverse=True)
+))
+
+# Words that mark a party_only query as a question rather than a bare party-name lookup
+_QUESTION_INDICATORS = frozenset({'what', 'how', 'why', 'when', 'where', 'which', 'who',
+                                  'holding', 'held', 'decide', 'rule', 'ruling', 'opinion',
+                                  'mean', 'explain', 'describe', 'tell', 'does', 'did', 'is', 'are', 'was', 'were',
+                                  'can', 'could', 'should', 'would'})
+
+# Stopwords dropped from party_only questions before searching the matched cases
+_PARTY_QUERY_STOPWORDS = frozenset({'the', 'a', 'an', 'is', 'are', 'was', 'were', 'in', 'from', 'to', 'of', 'for', 'on', 'at', 'by', 'with'})
+
+# Sentence starters that the "X v. Y" pattern can capture ahead of the plaintiff's name
+_PLAINTIFF_STOP_WORDS = frozenset({'Explain', 'Based', 'Using', 'According', 'Following', 'Regarding',
+                                   'What', 'How', 'Why', 'When', 'Where', 'Does', 'Did', 'Can', 'Should'})
+
+# Disambiguation replies returned when a selected option cannot be used
+_NOT_FOUND_TMPL = (
+    "**{case_name}** is not currently in our indexed database.\n\n"
+    "This case may be referenced in other opinions but hasn't been ingested yet.\n\n"
+    "**Available indexed options:**\n{other_options_text}\n\n"
+    "You can reply with the number of another option, or ask a new question."
+)
+
+_OUT_OF_RANGE_TMPL = (
+    "I only have {count} option(s). Please reply with a number from 1 to {count}, "
+    "or restate your question."
+)
+
+
+# "Plaintiff v. Defendant" mention used to check whether a named case made it into the results
+_CASE_VS_RX = re.compile(r'([A-Z][a-zA-Z0-9\-\.]+(?:\s+[A-Za-z\.]+)*)\s+v\.?\s+([A-Za-z][a-zA-Z0-9\-\.]+(?:\s+[A-Za-z\.]+)*)')
+
+# Numbered candidates ("1. **Case Name** (Appeal No. 20-1234)") in an AMBIGUOUS QUERY answer
+_NUMBERED_CASE_RX = re.compile(r'(\d+)\.\s+\*\*([^*]+)\*\*')
+_APPEAL_NO_RX = re.compile(r'Appeal\s*No\.?\s*(\d{2}-\d+)', re.IGNORECASE)
+
+
+
+def _merge_dedup_pages(primary: List[Dict], secondary: List[Dict], limit: Optional[int] = 15) -> Tuple[List[Dict], int]:
+    """Merge two page lists, primary first, dropping repeats of (opinion_id, page_number).
+    
+    Returns the merged pages (capped at limit) and how many distinct primary pages lead the list.
+    """
+    merged = {}
+    for p in primary:
+        merged.setdefault((p.get('opinion_id'), p.get('page_number')), p)
+    primary_count = len(merged)
+    for p in secondary:
+        merged.setdefault((p.get('opinion_id'), p.get('page_number')), p)
+    pages = list(merged.values())
+    return (pages[:limit] if limit is not None else pages), primary_count
+
+async def _search_pages_concurrently(queries: List[str], opinion_ids: Optional[List[str]], limit: int, party_only: bool = False) -> List[List[Dict]]:
+    """Run independent db.search_pages calls on the executor; results keep the order of queries."""
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*[
+        loop.run_in_executor(_executor, lambda q=q: db.search_pages(q, opinion_ids, limit=limit, party_only=party_only))
+        for q in queries
+    ])
+
+
+# (normalized message, opinion_ids, party_only, attorney_mode) -> (created_at, response).
+# Only stateless calls are cached: no conversation_id, or a conversation whose only
+# message is the question being answered. Once a conversation has history or a pending
+# disambiguation, the turn summary, pronoun resolution and candidate choice all change
+# the answer.
+_RESPONSE_CACHE: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_RESPONSE_CACHE_SIZE = 256
+_RESPONSE_CACHE_TTL = 900.0
+CHAT_RESPONSE_CACHE = os.environ.get("CHAT_RESPONSE_CACHE", "true").lower() == "true"
+
 async def generate_chat_response(
+    message: str,
+    opinion_ids: Optional[List[str]] = None,
+    conversation_id: Optional[str] = None,
+    party_only: bool = False,
+    attorney_mode: bool = False,
+    no_cache: bool = False
+) -> Dict[str, Any]:
+    """Answer a chat message; repeated stateless questions are served from _RESPONSE_CACHE.
+    
+    The first question of a new conversation counts as stateless, so UI traffic shares
+    the cache with conversation-less callers. Only grounded ("ok") answers that did
+    not trigger web ingestion are cached, so a NOT FOUND or an answer from a
+    just-grown corpus is always regenerated. Pass no_cache=True to force a fresh answer.
+    """
+    if no_cache or not CHAT_RESPONSE_CACHE:
+        return await _generate_chat_response(message, opinion_ids, conversation_id, party_only, attorney_mode)
+    if conversation_id:
+        loop = asyncio.get_running_loop()
+        try:
+            has_context = await loop.run_in_executor(_executor, db.conversation_has_context, conversation_id)
+        except Exception:
+            has_context = True
+        if has_context:
+            return await _generate_chat_response(message, opinion_ids, conversation_id, party_only, attorney_mode)
+    
+    key = (' '.join(message.lower().split()), tuple(sorted(opinion_ids or ())), party_only, attorney_mode)
+    cached = _RESPONSE_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _RESPONSE_CACHE_TTL:
+        _RESPONSE_CACHE.move_to_end(key)
+        response = copy.deepcopy(cached[1])
+        if isinstance(response.get("debug"), dict):
+            # The Voyager run belongs to the request that built the answer
+            response["debug"]["run_id"] = None
+            response["debug"]["response_cache_hit"] = True
+        return response
+    
+    response = await _generate_chat_response(message, opinion_ids, conversation_id, party_only, attorney_mode)
+    if response.get("return_branch") == "ok" and not response.get("web_search_triggered"):
+        _RESPONSE_CACHE[key] = (time.monotonic(), copy.deepcopy(response))
+        _RESPONSE_CACHE.move_to_end(key)
+        while len(_RESPONSE_CACHE) > _RESPONSE_CACHE_SIZE:
+            _RESPONSE_CACHE.popitem(last=False)
+    return response
+
+
+async def generate_chat_responses(
+    messages: List[str],
+    opinion_ids: Optional[List[str]] = None,
+    party_only: bool = False,
+    attorney_mode: bool = False
+) -> List[Dict[str, Any]]:
+    """Answer several independent questions concurrently, in input order.
+
+    Each question runs the full stateless pipeline; the LLM calls share
+    _OPENAI_LIMITER, so a large batch queues there rather than bursting.
+    """
+    return list(await asyncio.gather(*(
+        generate_chat_response(m, opinion_ids, party_only=party_only, attorney_mode=attorney_mode)
+        for m in messages
+    )))
+
+
+async def _generate_chat_response(
     message: str,
     opinion_ids: Optional[List[str]] = None,
     conversation_id: Optional[str] = None,
@@ -3248,25 +3901,13 @@ async def generate_chat_response(
                             # Case not in database - keep pending state so user can select another option
                             logging.info(f"Disambiguation: Case '{case_name}' not found in database, keeping pending state")
                             # List the other available options
-                            other_options = [f"{c.get('id')}. {c.get('label')}" for c in candidates if c.get('id') != selected.get('id')]
+                            sel_id = selected.get('id')
+                            other_options = [f"{cid}. {c.get('label')}" for c in candidates for cid in (c.get('id'),) if cid != sel_id]
                             other_options_text = "\n".join(other_options) if other_options else "No other options available."
                             return standardize_response({
-                                "answer_markdown": f"**{case_name}** is not currently in our indexed database.\n\nThis case may be referenced in other opinions but hasn't been ingested yet.\n\n**Available indexed options:**\n{other_options_text}\n\nYou can reply with the number of another option, or ask a new question.",
+                                "answer_markdown": _NOT_FOUND_TMPL.format_map({"case_name": case_name, "other_options_text": other_options_text}),
                                 "sources": [],
-                                "debug": {
-                                    "claims": [],
-                                    "support_audit": {"total_claims": 0, "supported_claims": 0, "unsupported_claims": 0},
-                                    "search_query": case_name,
-                                    "search_terms": [],
-                                    "pages_count": 0,
-                                    "pages_sample": [],
-                                    "markers_count": 0,
-                                    "markers": [],
-                                    "sources_count": 0,
-                                    "sources": [],
-                                    "raw_response": "",
-                                    "return_branch": "disambiguation_case_not_found"
-                                }
+                                "debug": _debug_envelope("disambiguation_case_not_found", search_query=case_name, raw_answer="")
                             })
                     
                     # Success - we found the case, now clear disambiguation state
@@ -3285,22 +3926,9 @@ async def generate_chat_response(
                     # Out of range selection
                     db.clear_pending_disambiguation(conversation_id)
                     return standardize_response({
-                        "answer_markdown": f"I only have {len(candidates)} option(s). Please reply with a number from 1 to {len(candidates)}, or restate your question.",
+                        "answer_markdown": _OUT_OF_RANGE_TMPL.format_map({"count": len(candidates)}),
                         "sources": [],
-                        "debug": {
-                            "claims": [],
-                            "support_audit": {"total_claims": 0, "supported_claims": 0, "unsupported_claims": 0},
-                            "search_query": message,
-                            "search_terms": [],
-                            "pages_count": 0,
-                            "pages_sample": [],
-                            "markers_count": 0,
-                            "markers": [],
-                            "sources_count": 0,
-                            "sources": [],
-                            "raw_response": "",
-                            "return_branch": "disambiguation_out_of_range"
-                        }
+                        "debug": _debug_envelope("disambiguation_out_of_range", search_query=message, raw_answer="")
                     })
             else:
                 # Keep pending state for one additional conversational follow-up.
@@ -3317,20 +3945,7 @@ async def generate_chat_response(
                             "pending": True,
                             "candidates": candidates
                         },
-                        "debug": {
-                            "claims": [],
-                            "support_audit": {"total_claims": 0, "supported_claims": 0, "unsupported_claims": 0},
-                            "search_query": message,
-                            "search_terms": [],
-                            "pages_count": 0,
-                            "pages_sample": [],
-                            "markers_count": 0,
-                            "markers": [],
-                            "sources_count": 0,
-                            "sources": [],
-                            "raw_response": "",
-                            "return_branch": "disambiguation_pending_followup"
-                        }
+                        "debug": _debug_envelope("disambiguation_pending_followup", search_query=message, raw_answer="")
                     })
 
                 # User sent a new query, not a selection - clear old disambiguation
@@ -3340,8 +3955,13 @@ async def generate_chat_response(
     if resolved_opinion_id:
         opinion_ids = [str(resolved_opinion_id)]
     
+    # message is final past this point; lowercase and tokenize it once for all keyword checks below
+    msg_lower = message.lower()
+    msg_words = msg_lower.split()
+    msg_word_set = {w.strip('?.,!') for w in msg_words}
+    
     # PRIORITY 2: Check for pronoun references to previously discussed case (e.g., "its holding", "this case")
-    if not resolved_opinion_id and conversation_id and has_pronoun_reference(message):
+    if not resolved_opinion_id and conversation_id and has_pronoun_reference(msg_lower):
         prev_case = get_previous_case_context(conversation_id)
         if prev_case and prev_case.get('opinion_id'):
             resolved_opinion_id = prev_case['opinion_id']
@@ -3383,19 +4003,16 @@ async def generate_chat_response(
         r'\b([A-Z][a-zA-Z\'\-\.]+(?:\s+[A-Za-z][a-zA-Z\'\-\.]+){0,2})\s+v\.?\s+([A-Za-z][a-zA-Z\'\-\.]+(?:\s+[A-Za-z\'\-\.]+){0,5})',
         message
     )
-    # Filter out patterns where plaintiff starts with common verbs/adjectives
-    stop_words = {'Explain', 'Based', 'Using', 'According', 'Following', 'Regarding', 
-                  'What', 'How', 'Why', 'When', 'Where', 'Does', 'Did', 'Can', 'Should'}
-    
     for match in case_patterns:
         plaintiff = match[0].strip()
         defendant = match[1].strip()
         
         # Strip leading stop words from plaintiff (sentence starters like "Does", "What")
         plaintiff_words = plaintiff.split()
-        while plaintiff_words and plaintiff_words[0] in stop_words:
-            plaintiff_words.pop(0)
-        plaintiff = ' '.join(plaintiff_words)
+        start = 0
+        while start < len(plaintiff_words) and plaintiff_words[start] in _PLAINTIFF_STOP_WORDS:
+            start += 1
+        plaintiff = ' '.join(plaintiff_words[start:])
         
         # Skip if no plaintiff remains after stripping
         if not plaintiff:
@@ -3450,33 +4067,33 @@ async def generate_chat_response(
                 ]
                 # Add common legal topic extractions
                 legal_terms = []
-                if 'claim construction' in message.lower():
+                if 'claim construction' in msg_lower:
                     legal_terms.append('claim construction')
-                if 'evidence' in message.lower():
+                if 'evidence' in msg_lower:
                     legal_terms.append('intrinsic evidence')
-                if 'obviousness' in message.lower():
+                if 'obviousness' in msg_lower:
                     legal_terms.append('obviousness')
-                if 'infringement' in message.lower():
+                if 'infringement' in msg_lower:
                     legal_terms.append('infringement')
-                if 'indefinite' in message.lower() or 'indefiniteness' in message.lower():
+                if 'indefinite' in msg_lower or 'indefiniteness' in msg_lower:
                     legal_terms.append('indefinite')
-                if 'eligible' in message.lower() or 'eligibility' in message.lower() or '101' in message:
+                if 'eligible' in msg_lower or 'eligibility' in msg_lower or '101' in message:
                     legal_terms.append('eligible abstract')
-                if 'written description' in message.lower():
+                if 'written description' in msg_lower:
                     legal_terms.append('written description')
-                if 'enablement' in message.lower():
+                if 'enablement' in msg_lower:
                     legal_terms.append('enablement')
-                if 'anticipat' in message.lower():  # anticipation, anticipated
+                if 'anticipat' in msg_lower:  # anticipation, anticipated
                     legal_terms.append('anticipation prior art')
                 if legal_terms:
                     search_terms.append(' '.join(legal_terms))
                 # Also try searching with just key legal words from case pages
                 search_terms.append('patent claim invalid')
                 
-                for search_term in search_terms:
-                    if not search_term.strip():
-                        continue
-                    named_case_pages = db.search_pages(search_term, named_case_ids, limit=10, party_only=False)
+                # Query all variants at once, then take the first non-empty one in priority order
+                search_terms = [t for t in search_terms if t.strip()]
+                term_results = await _search_pages_concurrently(search_terms, named_case_ids, limit=10)
+                for search_term, named_case_pages in zip(search_terms, term_results):
                     if named_case_pages:
                         logging.info(f"Found {len(named_case_pages)} pages from named case using: '{search_term[:50]}...'")
                         break
@@ -3507,7 +4124,6 @@ async def generate_chat_response(
     # SINGLE-PARTY NAME SEARCH: Detect party names without "v." pattern
     # Handles queries like "latest Apple case", "recent Samsung decision", "Google patent case"
     if not all_named_case_pages and not resolved_opinion_id and not opinion_ids:
-        msg_lower = message.lower()
         recency_keywords = {'latest', 'recent', 'newest', 'most recent', 'last', 'new'}
         wants_recency = any(kw in msg_lower for kw in recency_keywords)
         
@@ -3567,60 +4183,43 @@ async def generate_chat_response(
                             all_named_case_pages.append(page)
                     logging.info(f"[PARTY SEARCH] Added {len(party_pages)} pages from '{detected_party}' cases to context")
     
-    pages = db.search_pages(message, opinion_ids, limit=15, party_only=party_only)
-    
     # P0: Doctrine-triggered authoritative candidate injection
     # Classify query to determine if controlling SCOTUS cases should be injected
     doctrine_tag = ranking_scorer.classify_doctrine_tag(message)
     _doctrine_tag = doctrine_tag
+    controlling_case_patterns = ranking_scorer.get_controlling_framework_candidates(doctrine_tag) if doctrine_tag else None
+    
+    # The main FTS search and the controlling-case fetch only depend on the message,
+    # so run them side by side on the executor instead of back to back on the loop
+    loop = asyncio.get_running_loop()
+    search = loop.run_in_executor(_executor, lambda: db.search_pages(message, opinion_ids, limit=15, party_only=party_only))
+    if controlling_case_patterns:
+        pages, controlling_pages = await asyncio.gather(search, loop.run_in_executor(
+            _executor, lambda: db.fetch_controlling_scotus_pages(controlling_case_patterns, pages_per_case=2)
+        ))
+    else:
+        pages = await search
+    
     if doctrine_tag:
         logging.info(f"[DOCTRINE TAG] Query classified as: {doctrine_tag}")
-        controlling_case_patterns = ranking_scorer.get_controlling_framework_candidates(doctrine_tag)
         if controlling_case_patterns:
-            logging.info(f"[CONTROLLING INJECTION] Fetching SCOTUS candidates for doctrine={doctrine_tag}: {controlling_case_patterns}")
-            controlling_pages = db.fetch_controlling_scotus_pages(controlling_case_patterns, pages_per_case=2)
+            logging.info(f"[CONTROLLING INJECTION] Fetched SCOTUS candidates for doctrine={doctrine_tag}: {controlling_case_patterns}")
             if controlling_pages:
                 logging.info(f"[CONTROLLING INJECTION] Injected {len(controlling_pages)} controlling SCOTUS pages")
                 # Debug: log the first few injected pages with their origin
                 for cp in controlling_pages[:3]:
                     logging.info(f"[CONTROLLING INJECTION] Page: case={cp.get('case_name','?')[:40]}, origin={cp.get('origin')}, page={cp.get('page_number')}")
                 # Deduplicate and merge controlling pages with search results
-                seen_keys = set()
-                merged_controlling = []
-                # Add controlling pages first (highest priority)
-                for p in controlling_pages:
-                    key = (p.get('opinion_id'), p.get('page_number'))
-                    if key not in seen_keys:
-                        seen_keys.add(key)
-                        merged_controlling.append(p)
-                # Add original search results
-                for p in pages:
-                    key = (p.get('opinion_id'), p.get('page_number'))
-                    if key not in seen_keys:
-                        seen_keys.add(key)
-                        merged_controlling.append(p)
-                pages = merged_controlling
+                # Controlling pages first (highest priority), then original search results
+                pages, _ = _merge_dedup_pages(controlling_pages, pages, limit=None)
             else:
                 logging.warning(f"[CONTROLLING INJECTION] No SCOTUS cases found for {controlling_case_patterns} - may be missing from corpus")
     
     # Merge named case results with FTS results, prioritizing ALL named cases
     # Use all_named_case_pages which contains pages from ALL mentioned cases
     if all_named_case_pages:
-        seen_keys = set()
-        merged_pages = []
-        # Add ALL named case pages first (these are already deduplicated)
-        for p in all_named_case_pages:
-            key = (p.get('opinion_id'), p.get('page_number'))
-            if key not in seen_keys:
-                seen_keys.add(key)
-                merged_pages.append(p)
-        # Add remaining FTS results
-        for p in pages:
-            key = (p.get('opinion_id'), p.get('page_number'))
-            if key not in seen_keys:
-                seen_keys.add(key)
-                merged_pages.append(p)
-        pages = merged_pages[:15]  # Keep top 15
+        # ALL named case pages first (already deduplicated), then remaining FTS results
+        pages, _ = _merge_dedup_pages(all_named_case_pages, pages)  # Keep top 15
         logging.info(f"Context Merge Success - {len(all_named_case_pages)} named case pages + FTS = {len(pages)} total")
     
     # Phase 1 Smartness: Augment retrieval when baseline results are thin
@@ -3653,7 +4252,7 @@ async def generate_chat_response(
     if needs_fallback and not party_only:
         # QUERY EXPANSION: Use GPT-4o to generate related legal keywords for conceptual queries
         # This helps find relevant cases for abstract legal concepts like "after-arising technology"
-        expanded_terms = expand_query_with_legal_terms(message)
+        expanded_terms = await expand_query_cached(message)
         
         if expanded_terms:
             # Search with expanded terms first
@@ -3661,8 +4260,7 @@ async def generate_chat_response(
             all_expanded_pages = []
             seen_expanded_keys = set()
             
-            for term in expanded_terms:
-                results = db.search_pages(term, opinion_ids, limit=5, party_only=False)
+            for results in await _search_pages_concurrently(expanded_terms, opinion_ids, limit=5):
                 for p in results:
                     key = (p.get('opinion_id'), p.get('page_number'))
                     if key not in seen_expanded_keys:
@@ -3670,27 +4268,14 @@ async def generate_chat_response(
                         all_expanded_pages.append(p)
             
             if all_expanded_pages:
-                # Sort by rank and use expanded results
-                all_expanded_pages.sort(key=lambda x: x.get('rank', 0), reverse=True)
+                # Keep only the top-ranked expanded results; at most 15 survive either merge below,
+                # and nlargest keeps sorted()'s tie order
+                all_expanded_pages = heapq.nlargest(15, all_expanded_pages, key=lambda x: x.get('rank', 0))
                 
                 # CONTEXT MERGE PERSISTENCE: Preserve named case pages - merge AFTER query expansion
                 if named_case_pages:
-                    # Add named case pages first (highest priority - they must NEVER be dropped)
-                    seen_keys = set()
-                    merged = []
-                    for p in named_case_pages:
-                        key = (p.get('opinion_id'), p.get('page_number'))
-                        if key not in seen_keys:
-                            seen_keys.add(key)
-                            merged.append(p)
-                    named_case_count = len(merged)
-                    # Then add expanded results
-                    for p in all_expanded_pages:
-                        key = (p.get('opinion_id'), p.get('page_number'))
-                        if key not in seen_keys:
-                            seen_keys.add(key)
-                            merged.append(p)
-                    pages = merged[:15]
+                    # Named case pages first (highest priority - they must NEVER be dropped), then expanded results
+                    pages, named_case_count = _merge_dedup_pages(named_case_pages, all_expanded_pages)
                     # DEBUG: Log context merge success
                     logging.info(f"DEBUG: Context Merge Success - {named_case_count} named case pages + {len(pages) - named_case_count} expanded pages = {len(pages)} total")
                 else:
@@ -3701,110 +4286,64 @@ async def generate_chat_response(
         
         # If expansion didn't help, fall back to manual token extraction
         if not pages or len(pages) < 3:
-            # Common English stopwords to remove
-            stopwords = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'in', 'from', 'to', 'of', 'for', 
-                         'on', 'at', 'by', 'with', 'it', 'its', 'this', 'that', 'be', 'been', 'being',
-                         'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
-                         'may', 'might', 'must', 'shall', 'can', 'and', 'or', 'but', 'if', 'when',
-                         'what', 'how', 'why', 'where', 'which', 'who', 'whom', 'whose', 'than', 'then',
-                         'so', 'as', 'not', 'no', 'yes', 'about', 'into', 'through', 'during', 'before',
-                         'after', 'above', 'below', 'between', 'under', 'again', 'further', 'once',
-                         'here', 'there', 'all', 'each', 'few', 'more', 'most', 'other', 'some', 'such',
-                         'only', 'own', 'same', 'too', 'very', 'just', 'also', 'now', 'even', 'still',
-                         'already', 'always', 'never', 'ever', 'often', 'sometimes', 'usually'}
-            
-            # Clean and tokenize the query
-            # Remove section symbols, punctuation, and normalize
-            cleaned_query = re.sub(r'[§\?!.,;:\'"()\[\]{}]', ' ', message)
-            tokens = cleaned_query.lower().split()
-            
-            # Filter: remove stopwords, short tokens (<=2 chars), and pure numbers
+            # Clean and tokenize the query: drop section symbols and punctuation, then
+            # remove stopwords, short tokens (<=2 chars), and pure numbers
+            tokens = msg_lower.translate(_PUNCT_TABLE).split()
             meaningful_tokens = [
                 t for t in tokens 
-                if t not in stopwords and len(t) > 2 and not t.isdigit()
+                if t not in _STOPWORDS and len(t) > 2 and not t.isdigit()
             ]
             
             # Add domain-specific legal terms based on query context
             domain_terms = []
-            message_lower = message.lower()
-            if 'reissue' in message_lower or '251' in message_lower:
-                domain_terms.extend(['reissue', 'recapture', 'broadening', 'broaden', 'enlarge', 'scope', 'original'])
-            if 'claim' in message_lower:
-                domain_terms.extend(['claim', 'claims', 'limitation', 'element'])
-            if 'patent' in message_lower or 'prior art' in message_lower:
-                domain_terms.extend(['patent', 'obviousness', 'anticipation', 'novelty', 'prior'])
-            if 'infringement' in message_lower:
-                domain_terms.extend(['infringement', 'infringe', 'infringes', 'literal', 'doctrine', 'equivalents'])
-            if 'alice' in message_lower or 'mayo' in message_lower or 'eligibility' in message_lower or '101' in message_lower:
-                domain_terms.extend(['alice', 'mayo', 'eligibility', 'abstract', 'idea', 'ineligible', 'section', 'step'])
+            matched_keywords = set(_DOMAIN_KEYWORD_RE.findall(msg_lower))
+            for keywords, terms in _DOMAIN_EXPANSIONS:
+                if not matched_keywords.isdisjoint(keywords):
+                    domain_terms.extend(terms)
             
             # Combine meaningful tokens with domain terms (deduplicate)
-            all_search_tokens = list(set(meaningful_tokens + domain_terms))
-            
-            # Search each token individually and merge results
-            all_pages = []
-            seen_page_keys = set()
+            all_search_tokens = {*meaningful_tokens, *domain_terms}
             
-            for token in all_search_tokens:
-                if token and len(token) > 2:
-                    results = db.search_pages(token, opinion_ids, limit=5, party_only=False)
-                    for p in results:
-                        key = (p.get('opinion_id'), p.get('page_number'))
-                        if key not in seen_page_keys:
-                            seen_page_keys.add(key)
-                            all_pages.append(p)
-            
-            # Sort by rank (higher is better) and keep top 15
-            all_pages.sort(key=lambda x: x.get('rank', 0), reverse=True)
+            # One OR query over all tokens; rows come back distinct and ranked
+            loop = asyncio.get_running_loop()
+            all_pages = await loop.run_in_executor(
+                _executor, lambda: db.search_pages_multi(all_search_tokens, opinion_ids, limit=15)
+            )
             
             # CONTEXT MERGE PERSISTENCE: Preserve named case pages in manual fallback too
             if named_case_pages:
-                seen_keys = set()
-                merged = []
-                for p in named_case_pages:
-                    key = (p.get('opinion_id'), p.get('page_number'))
-                    if key not in seen_keys:
-                        seen_keys.add(key)
-                        merged.append(p)
-                named_case_count = len(merged)
-                for p in all_pages:
-                    key = (p.get('opinion_id'), p.get('page_number'))
-                    if key not in seen_keys:
-                        seen_keys.add(key)
-                        merged.append(p)
-                pages = merged[:15]
+                pages, named_case_count = _merge_dedup_pages(named_case_pages, all_pages)
                 logging.info(f"DEBUG: Context Merge Success (fallback) - {named_case_count} named case pages preserved")
             else:
                 pages = all_pages[:15]
             
             # Update search_terms to reflect what we actually searched for
             if pages:
-                search_terms = all_search_tokens
+                search_terms = list(all_search_tokens)
     
     # Check if query references a specific case name (e.g., "H-W Technologies v. Overstock")
     # and trigger web search if that case isn't in our database
     # Case-insensitive matching for defendant to handle lowercase inputs like "overstock"
-    specific_case_match = re.search(r'([A-Z][a-zA-Z0-9\-\.]+(?:\s+[A-Za-z\.]+)*)\s+v\.?\s+([A-Za-z][a-zA-Z0-9\-\.]+(?:\s+[A-Za-z\.]+)*)', message)
-    if specific_case_match and pages:
+    specific_case_match = _CASE_VS_RX.search(message) if pages else None
+    if specific_case_match:
         plaintiff = specific_case_match.group(1).strip()
         defendant = specific_case_match.group(2).strip()
         specific_case_name = f"{plaintiff} v. {defendant}"
         
         # Check if any of our results are from this specific case
-        case_names_in_results = [p.get('case_name', '').lower() for p in pages]
         plaintiff_lower = plaintiff.lower().rstrip('s')  # Handle plural (Technologies -> Technology)
         defendant_lower = defendant.lower().rstrip('s')
         
         # Also check with shorter name stems for fuzzy matching
-        plaintiff_stem = plaintiff_lower.replace('.', '').replace(',', '').split()[0] if plaintiff_lower else ''
-        defendant_stem = defendant_lower.replace('.', '').replace(',', '').split()[0] if defendant_lower else ''
+        plaintiff_stem = plaintiff_lower.translate(_PUNCT_DEL).split(None, 1)[0] if plaintiff_lower else ''
+        defendant_stem = defendant_lower.translate(_PUNCT_DEL).split(None, 1)[0] if defendant_lower else ''
         
         # Check if either party name appears in any of our result case names
         found_specific_case = any(
             (plaintiff_lower in name or defendant_lower in name or
              (plaintiff_stem and plaintiff_stem in name) or 
              (defendant_stem and defendant_stem in name))
-            for name in case_names_in_results
+            for name in (p.get('case_name', '').lower() for p in pages)
         )
         
         if not found_specific_case:
@@ -3819,20 +4358,7 @@ async def generate_chat_response(
                 
                 # CONTEXT MERGE PERSISTENCE: Preserve named case pages even after web search
                 if named_case_pages:
-                    seen_keys = set()
-                    merged = []
-                    for p in named_case_pages:
-                        key = (p.get('opinion_id'), p.get('page_number'))
-                        if key not in seen_keys:
-                            seen_keys.add(key)
-                            merged.append(p)
-                    named_case_count = len(merged)
-                    for p in web_pages:
-                        key = (p.get('opinion_id'), p.get('page_number'))
-                        if key not in seen_keys:
-                            seen_keys.add(key)
-                            merged.append(p)
-                    pages = merged[:15]
+                    pages, named_case_count = _merge_dedup_pages(named_case_pages, web_pages)
                     logging.info(f"DEBUG: Context Merge Success (web search) - {named_case_count} named case pages + {len(pages) - named_case_count} web search pages = {len(pages)} total")
                 else:
                     pages = web_pages
@@ -3853,51 +4379,49 @@ async def generate_chat_response(
                     pass  # We'll still try with existing pages but add web info later
     
     # Detect if the query looks like a question vs a simple party name lookup
-    question_indicators = ['what', 'how', 'why', 'when', 'where', 'which', 'who', 
-                           'holding', 'held', 'decide', 'rule', 'ruling', 'opinion',
-                           'mean', 'explain', 'describe', 'tell', 'does', 'did', 'is', 'are', 'was', 'were',
-                           'can', 'could', 'should', 'would', '?']
-    message_lower = message.lower()
-    is_question = any(word in message_lower for word in question_indicators) or len(message.split()) > 4
+    is_question = '?' in message or not msg_word_set.isdisjoint(_QUESTION_INDICATORS) or len(msg_words) > 4
     
     # For party-only searches with a simple party name (not a question), list matching cases
     if party_only and pages and not is_question:
-        # Group by unique cases
-        seen_cases = {}
-        for page in pages:
-            case_key = page.get('opinion_id')
-            if case_key not in seen_cases:
-                seen_cases[case_key] = page
-        
-        # Build sources from matching cases
+        # One pass: dedupe by case, build each source and its listing line together
         sources = []
-        for i, (case_id, page) in enumerate(seen_cases.items(), 1):
+        case_lines = []
+        seen_cases = set()
+        for page in pages:
+            case_id = page.get('opinion_id')
+            if case_id in seen_cases:
+                continue
+            seen_cases.add(case_id)
+            case_name = page.get("case_name", "")
+            appeal_no = page.get("appeal_no", "")
+            release_date = page.get("release_date", "")
+            page_number = page.get("page_number", 1)
+            viewer_url = f"/opinions/{case_id}?page={page_number}"
             sources.append(normalize_source({
-                "sid": f"S{i}",
+                "sid": f"S{len(sources) + 1}",
                 "opinionId": case_id,
                 "opinion_id": case_id,
-                "caseName": page.get("case_name", ""),
-                "case_name": page.get("case_name", ""),
-                "appealNo": page.get("appeal_no", ""),
-                "appeal_no": page.get("appeal_no", ""),
-                "releaseDate": page.get("release_date", ""),
-                "release_date": page.get("release_date", ""),
-                "pageNumber": page.get("page_number", 1),
-                "page_number": page.get("page_number", 1),
+                "caseName": case_name,
+                "case_name": case_name,
+                "appealNo": appeal_no,
+                "appeal_no": appeal_no,
+                "releaseDate": release_date,
+                "release_date": release_date,
+                "pageNumber": page_number,
+                "page_number": page_number,
+                # The sources panel renders each listed case's quote; extraction is a strip + slice
                 "quote": extract_exact_quote_from_page(page.get("text", ""), min_len=50, max_len=200),
-                "viewerUrl": f"/opinions/{case_id}?page={page.get('page_number', 1)}",
-                "viewer_url": f"/opinions/{case_id}?page={page.get('page_number', 1)}",
+                "viewerUrl": viewer_url,
+                "viewer_url": viewer_url,
                 "pdfUrl": page.get("pdf_url", ""),
                 "pdf_url": page.get("pdf_url", ""),
                 "tier": "moderate",
                 "binding_method": "party_listing"
             }))
+            case_lines.append(f"- **{case_name}** ({appeal_no}, {release_date})")
         
         # Build a summary response listing the matching cases
-        case_list = "\n".join([
-            f"- **{s['caseName']}** ({s['appealNo']}, {s['releaseDate']})" 
-            for s in sources
-        ])
+        case_list = "\n".join(case_lines)
         answer = f"Found {len(sources)} case(s) where \"{message}\" appears as a party:\n\n{case_list}\n\nAsk a specific question about these cases (e.g., \"What was the holding in the Google case?\") to get detailed analysis."
         
         return standardize_response({
@@ -3909,11 +4433,11 @@ async def generate_chat_response(
                 "search_query": message,
                 "search_terms": search_terms,
                 "pages_count": len(pages),
-                "pages_sample": [{"opinion_id": p.get("opinion_id"), "case_name": p.get("case_name"), "page_number": p.get("page_number")} for p in pages[:5]],
+                "pages_sample": _debug_pages_sample(pages),
                 "markers_count": 0,
                 "markers": [],
                 "sources_count": len(sources),
-                "sources": [{"sid": s.get("sid"), "opinionId": s.get("opinionId"), "caseName": s.get("caseName")} for s in sources[:10]],
+                "sources": [{"sid": s.get("sid"), "opinionId": s.get("opinionId"), "caseName": s.get("caseName")} for s in sources[:10]] if CHAT_DEBUG_SAMPLES else [],
                 "raw_response": None,
                 "return_branch": "party_only_listing"
             }
@@ -3922,65 +4446,43 @@ async def generate_chat_response(
     # For party-only mode with a question, find cases by party name then search their content
     if party_only and is_question:
         # Extract potential party names from the question (proper nouns, capitalized words)
-        words = message.split()
-        potential_parties = [w.strip('?.,!') for w in words if len(w) > 0 and w[0].isupper() and len(w) > 2 and w.lower() not in question_indicators]
+        # Strip punctuation once; both the party and search-term filters reuse it
+        stripped_words = [w.strip('?.,!') for w in message.split()]
+        potential_parties = [w for w in stripped_words if len(w) > 2 and w[0].isupper() and w.lower() not in _QUESTION_INDICATORS]
         
         if potential_parties:
             # Search for cases matching the party names
             party_cases = []
-            for party in potential_parties:
-                party_pages = db.search_pages(party, None, limit=10, party_only=True)
+            seen_oids = set()
+            for party_pages in await _search_pages_concurrently(potential_parties, None, limit=10, party_only=True):
                 for p in party_pages:
-                    if p.get('opinion_id') not in [c.get('opinion_id') for c in party_cases]:
+                    oid = p.get('opinion_id')
+                    if oid not in seen_oids:
+                        seen_oids.add(oid)
                         party_cases.append(p)
             
             if party_cases:
                 # Get the opinion IDs from matching party cases
-                party_opinion_ids = [str(p.get('opinion_id')) for p in party_cases]
-                party_opinion_ids = list(set(party_opinion_ids))
+                party_opinion_ids = [str(oid) for oid in seen_oids]
                 
                 # Extract meaningful search terms from the question (remove stopwords and question words)
-                stopwords = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'in', 'from', 'to', 'of', 'for', 'on', 'at', 'by', 'with'}
-                meaningful_words = [w.strip('?.,!').lower() for w in words 
-                                   if w.strip('?.,!').lower() not in stopwords 
-                                   and w.strip('?.,!').lower() not in question_indicators
-                                   and w.strip('?.,!') not in potential_parties
-                                   and len(w.strip('?.,!')) > 2]
+                party_words = set(potential_parties)
+                meaningful_words = [w.lower() for w in stripped_words
+                                   if len(w) > 2 and w not in party_words]
+                meaningful_words = [w for w in meaningful_words
+                                   if w not in _PARTY_QUERY_STOPWORDS and w not in _QUESTION_INDICATORS]
                 
                 # Add legal-specific search terms based on question context
                 legal_terms = []
-                if any(t in message.lower() for t in ['holding', 'held', 'decide', 'rule', 'ruling']):
+                if any(t in msg_lower for t in ['holding', 'held', 'decide', 'rule', 'ruling']):
                     legal_terms.extend(['affirm', 'reverse', 'remand', 'held', 'hold', 'conclude'])
                 
-                # Search strategy: try multiple approaches to find relevant content
-                # Note: PostgreSQL plainto_tsquery uses AND for multiple words,
-                # so we search each term individually and combine results
-                
-                all_pages = []
-                seen_page_keys = set()
-                
-                # First try meaningful words individually
-                for word in meaningful_words:
-                    if word and len(word) > 2:
-                        results = db.search_pages(word, party_opinion_ids, limit=5, party_only=False)
-                        for p in results:
-                            key = (p.get('opinion_id'), p.get('page_number'))
-                            if key not in seen_page_keys:
-                                seen_page_keys.add(key)
-                                all_pages.append(p)
-                
-                # Then try legal terms individually
-                for term in legal_terms:
-                    results = db.search_pages(term, party_opinion_ids, limit=5, party_only=False)
-                    for p in results:
-                        key = (p.get('opinion_id'), p.get('page_number'))
-                        if key not in seen_page_keys:
-                            seen_page_keys.add(key)
-                            all_pages.append(p)
-                
-                # Sort by rank (if available) and limit
-                all_pages.sort(key=lambda x: x.get('rank', 0), reverse=True)
-                pages = all_pages[:15]
+                # plainto_tsquery would AND every word together, so search meaningful words and
+                # legal terms as one OR query; rows come back distinct and ranked
+                loop = asyncio.get_running_loop()
+                pages = await loop.run_in_executor(
+                    _executor, lambda: db.search_pages_multi(meaningful_words + legal_terms, party_opinion_ids, limit=15)
+                )
     
     if not pages:
         web_search_result = await try_web_search_and_ingest(message, conversation_id)
@@ -4016,21 +4518,7 @@ async def generate_chat_response(
                 "answer_markdown": web_info,
                 "sources": [],
                 "web_search_triggered": True,
-                "debug": {
-                    "claims": [],
-                    "support_audit": {"total_claims": 0, "supported_claims": 0, "unsupported_claims": 1},
-                    "search_query": message,
-                    "search_terms": search_terms,
-                    "pages_count": 0,
-                    "pages_sample": [],
-                    "markers_count": 0,
-                    "markers": [],
-                    "sources_count": 0,
-                    "sources": [],
-                    "raw_response": None,
-                    "return_branch": "not_found_web_search_attempted",
-                    "web_search_result": web_search_result
-                }
+                "debug": _debug_envelope("not_found_web_search_attempted", search_query=message, search_terms=search_terms, unsupported_claims=1, extras={"web_search_result": web_search_result})
             })
         else:
             # ═══════════════════════════════════════════════════════════════════
@@ -4083,21 +4571,7 @@ async def generate_chat_response(
                 return standardize_response({
                     "answer_markdown": "No matching case found in the indexed opinions.\n\nTo analyze a specific case, please ensure it has been ingested, or try searching with different terms.",
                     "sources": [],
-                    "debug": {
-                        "claims": [],
-                        "support_audit": {"total_claims": 0, "supported_claims": 0, "unsupported_claims": 1},
-                        "search_query": message,
-                        "search_terms": search_terms,
-                        "pages_count": 0,
-                        "pages_sample": [],
-                        "markers_count": 0,
-                        "markers": [],
-                        "sources_count": 0,
-                        "sources": [],
-                        "raw_response": None,
-                        "return_branch": "not_found_case_specific_no_pages",
-                        "query_type": query_type
-                    }
+                    "debug": _debug_envelope("not_found_case_specific_no_pages", search_query=message, search_terms=search_terms, unsupported_claims=1, extras={"query_type": query_type})
                 })
     
     # Assess retrieval confidence for logging
@@ -4123,7 +4597,7 @@ async def generate_chat_response(
     expanded_pages = db.fetch_adjacent_pages(pages, window_size=adjacent_window, max_text_chars=4000)
     
     # Build context and conversation summary in parallel for speed
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     
     async def build_context_async():
         # Use quote-first generation with expanded pages: pre-extract quotable passages
@@ -4134,17 +4608,8 @@ async def generate_chat_response(
     
     async def get_cached_definitions_async():
         # Check if query mentions common legal tests
-        cached_def = None
-        query_lower = message.lower()
-        if 'alice' in query_lower or 'mayo' in query_lower or '101' in query_lower:
-            cached_def = get_cached_legal_definition('alice_mayo')
-        elif 'obviousness' in query_lower or 'obvious' in query_lower or '103' in query_lower:
-            cached_def = get_cached_legal_definition('obviousness')
-        elif 'claim construction' in query_lower or 'phillips' in query_lower:
-            cached_def = get_cached_legal_definition('claim_construction')
-        elif 'willful' in query_lower or 'enhanced damages' in query_lower:
-            cached_def = get_cached_legal_definition('willful_infringement')
-        return cached_def
+        definition_key = legal_definition_key(msg_lower)
+        return get_cached_legal_definition(definition_key) if definition_key else None
     
     # Run context building, summary generation, and cache lookup in parallel
     context_result, conv_summary, cached_definition = await asyncio.gather(
@@ -4156,16 +4621,18 @@ async def generate_chat_response(
     # Unpack context result (now returns tuple with quote_registry)
     context, quote_registry = context_result
     
-    # Build enhanced system prompt with conversation context and cached definitions
+    # Build enhanced system prompt with conversation context and cached definitions.
+    # SYSTEM_PROMPT must stay the leading, byte-identical prefix so the provider's
+    # prompt cache can reuse it; everything per-request is appended after it.
     enhanced_prompt = SYSTEM_PROMPT
     
     if conv_summary:
-        enhanced_prompt = conv_summary + "\n" + enhanced_prompt
+        enhanced_prompt += "\n\n" + conv_summary
     
     if cached_definition:
         enhanced_prompt += f"\n\nREFERENCE FRAMEWORK:\n{cached_definition}"
     
-    doctrine_context = _build_doctrine_context_for_prompt(message.lower())
+    doctrine_context = _build_doctrine_context_for_prompt(msg_lower)
     if doctrine_context:
         enhanced_prompt += doctrine_context
         logging.info(f"Doctrine context injected for query ({len(doctrine_context)} chars)")
@@ -4206,8 +4673,7 @@ Do NOT ask the user to specify which case — summarize each relevant case you h
 If the user asked for the "latest" or "most recent" case, focus primarily on the first/most recent case listed."""
     
     # DEBUG: Agentic Reasoning Plan logging
-    query_lower = message.lower()
-    reasoning_plan = _build_agentic_reasoning_plan(query_lower, pages)
+    reasoning_plan = _build_agentic_reasoning_plan(msg_lower, pages)
     logging.info(f"DEBUG: Agentic Reasoning Plan: {reasoning_plan}")
     
     # Dynamic max_tokens — must accommodate full answer + CITATION_MAP block.
@@ -4223,28 +4689,28 @@ If the user asked for the "latest" or "most recent" case, focus primarily on the
     # Configurable model via environment variable
     model_name = os.environ.get("CHAT_MODEL", "gpt-4o")
     
+    # Overlap the fallback's case lookup with the LLM call; nothing is ingested
+    # unless the answer comes back NOT FOUND
+    web_lookup_task = start_web_lookup(message, retrieval_confidence)
+    
     try:
-        response = await asyncio.wait_for(
-            loop.run_in_executor(
-                _executor,
-                lambda: client.chat.completions.create(
-                    model=model_name,
-                    messages=[
-                        {"role": "system", "content": enhanced_prompt},
-                        {"role": "user", "content": message}
-                    ],
-                    temperature=0.1,  # Lower for more deterministic, less hallucination
-                    max_tokens=max_tokens,
-                    timeout=90.0  # Increased API timeout
-                )
+        raw_answer, finish_reason = await asyncio.wait_for(
+            stream_completion_until_not_found_async(
+                client,
+                model=model_name,
+                messages=[
+                    {"role": "system", "content": enhanced_prompt},
+                    {"role": "user", "content": message}
+                ],
+                temperature=0.1,  # Lower for more deterministic, less hallucination
+                max_tokens=max_tokens,
+                timeout=90.0  # Increased API timeout
             ),
             timeout=120.0  # Increased asyncio timeout
         )
-        
-        raw_answer = response.choices[0].message.content or "No response generated."
+        raw_answer = raw_answer or "No response generated."
 
         # P0-3: Detect token-limit truncation — CITATION_MAP is written last and is first to be cut
-        finish_reason = response.choices[0].finish_reason
         if finish_reason == "length":
             logging.warning(
                 f"RESPONSE_TRUNCATED: finish_reason=length, max_tokens={max_tokens}, "
@@ -4301,15 +4767,13 @@ If the user asked for the "latest" or "most recent" case, focus primarily on the
                 ]
                 
                 retry_response = await asyncio.wait_for(
-                    loop.run_in_executor(
-                        _executor,
-                        lambda: client.chat.completions.create(
-                            model=model_name,
-                            messages=retry_messages,
-                            temperature=0.1,
-                            max_tokens=max_tokens,
-                            timeout=90.0
-                        )
+                    create_chat_completion(
+                        client,
+                        model=model_name,
+                        messages=retry_messages,
+                        temperature=0.1,
+                        max_tokens=max_tokens,
+                        timeout=90.0
                     ),
                     timeout=120.0
                 )
@@ -4344,16 +4808,19 @@ If the user asked for the "latest" or "most recent" case, focus primarily on the
         # Skip this if validator already handled the refusal
         # Don't trigger if the AI provided substantive content but also included a NOT FOUND caveat
         is_not_found_response = (
-            raw_answer.upper().strip().startswith("NOT FOUND") or
-            len(raw_answer.strip()) < 200 and "NOT FOUND" in raw_answer.upper()
+            _NOT_FOUND_PREFIX_RX.match(raw_answer) is not None or
+            len(raw_answer.strip()) < 200 and _NOT_FOUND_RX.search(raw_answer) is not None
         )
         
+        if web_lookup_task and not is_not_found_response:
+            web_lookup_task.cancel()
+        
         if is_not_found_response:
             # AI couldn't find relevant info in local results - try web search as fallback
             logging.info(f"AI returned NOT FOUND (primary), attempting web search fallback for: {message[:100]}")
             
             try:
-                web_search_result = await try_web_search_and_ingest(message, conversation_id)
+                web_search_result = await web_search_fallback(message, conversation_id, web_lookup_task)
                 
                 if web_search_result.get("success") and web_search_result.get("new_pages"):
                     # Successfully ingested new cases, retry with the new pages
@@ -4367,18 +4834,16 @@ If the user asked for the "latest" or "most recent" case, focus primarily on the
                     try:
                         # Make new API call with fresh context
                         retry_response = await asyncio.wait_for(
-                            asyncio.get_event_loop().run_in_executor(
-                                _executor,
-                                lambda: client.chat.completions.create(
-                                    model=model_name,
-                                    messages=[
-                                        {"role": "system", "content": SYSTEM_PROMPT},
-                                        {"role": "user", "content": new_user_prompt}
-                                    ],
-                                    temperature=0.1,
-                                    max_tokens=max_tokens,
-                                    timeout=90.0
-                                )
+                            create_chat_completion(
+                                client,
+                                model=model_name,
+                                messages=[
+                                    {"role": "system", "content": SYSTEM_PROMPT},
+                                    {"role": "user", "content": new_user_prompt}
+                                ],
+                                temperature=0.1,
+                                max_tokens=max_tokens,
+                                timeout=90.0
                             ),
                             timeout=120.0
                         )
@@ -4464,28 +4929,29 @@ If the user asked for the "latest" or "most recent" case, focus primarily on the
             # "1. **Case Name**, cited in multiple cases"
             
             # First pattern: numbered case with bold name and optional appeal info
-            case_pattern = r'(\d+)\.\s+\*\*([^*]+)\*\*'
-            for match in re.finditer(case_pattern, raw_answer):
+            for match in _NUMBERED_CASE_RX.finditer(raw_answer):
                 num = match.group(1)
                 case_name = match.group(2).strip().rstrip(',')
                 
-                # Try to extract appeal number from text after the case name
-                remaining_text = raw_answer[match.end():match.end()+100]
-                appeal_match = re.search(r'Appeal\s*No\.?\s*(\d{2}-\d+)', remaining_text, re.IGNORECASE)
+                # Try to extract appeal number from the 100 chars after the case name; pos/endpos
+                # bound the search without slicing, and the window may cross a line break
+                appeal_match = _APPEAL_NO_RX.search(raw_answer, match.end(), match.end() + 100)
                 appeal_no = appeal_match.group(1) if appeal_match else ""
                 
-                # Look up the opinion_id for this case to enable direct selection
-                case_lookup = db.search_pages(case_name, None, limit=1, party_only=True)
-                opinion_id = case_lookup[0].get('opinion_id') if case_lookup else None
-                
                 action_items.append({
                     "id": num,
                     "label": case_name,
                     "appeal_no": appeal_no,
                     "action": f"What is the holding in {case_name}?",
-                    "opinion_id": str(opinion_id) if opinion_id else None
+                    "opinion_id": None
                 })
             
+            # Look up opinion_ids for all candidates in one query to enable direct selection
+            if action_items:
+                opinion_ids_by_name = db.lookup_opinion_ids_by_names([item["label"] for item in action_items])
+                for item in action_items:
+                    item["opinion_id"] = opinion_ids_by_name.get(item["label"])
+            
             # STORE disambiguation candidates in DB for next turn resolution
             if conversation_id and action_items:
                 db.set_pending_disambiguation(
@@ -4503,20 +4969,7 @@ If the user asked for the "latest" or "most recent" case, focus primarily on the
                     "pending": True,
                     "candidates": action_items
                 },
-                "debug": {
-                    "claims": [],
-                    "support_audit": {"total_claims": 0, "supported_claims": 0, "unsupported_claims": 0},
-                    "search_query": message,
-                    "search_terms": search_terms,
-                    "pages_count": len(pages),
-                    "pages_sample": [{"opinion_id": p.get("opinion_id"), "case_name": p.get("case_name"), "page_number": p.get("page_number")} for p in pages[:5]],
-                    "markers_count": 0,
-                    "markers": [],
-                    "sources_count": 0,
-                    "sources": [],
-                    "raw_response": raw_answer,
-                    "return_branch": "disambiguation"
-                }
+                "debug": _debug_envelope("disambiguation", search_query=message, search_terms=search_terms, pages=pages, raw_answer=raw_answer)
             })
         
         markers = extract_cite_markers(raw_answer)
@@ -4533,7 +4986,10 @@ If the user asked for the "latest" or "most recent" case, focus primarily on the
             f"retrieval_confidence={retrieval_confidence}"
         )
 
-        sources, position_to_sid = build_sources_from_markers(markers, pages, search_terms)
+        # Verification is CPU-heavy and may fetch pages from the DB; keep it off the event loop
+        sources, position_to_sid = await loop.run_in_executor(
+            _executor, lambda: build_sources_from_markers(markers, pages, search_terms)
+        )
         sources = curate_sources_for_mode(sources, attorney_mode)
         
         # CITATION_MAP was absent from the LLM response.
@@ -4541,7 +4997,7 @@ If the user asked for the "latest" or "most recent" case, focus primarily on the
         # or (b) the token budget was still too low and CITATION_MAP was truncated.
         # Do NOT fabricate citations from retrieval pages — this creates false correlation
         # between the answer text and unrelated cases.
-        if not sources and pages and len(raw_answer) > 200 and "NOT FOUND" not in raw_answer.upper()[:100]:
+        if not sources and pages and len(raw_answer) > 200 and not _NOT_FOUND_RX.search(raw_answer, 0, 100):
             logging.warning(
                 f"CITATION_MAP_MISSING: LLM returned substantive answer ({len(raw_answer)} chars) "
                 f"with {len(pages)} context pages but no CITATION_MAP markers. "
@@ -4556,20 +5012,7 @@ If the user asked for the "latest" or "most recent" case, focus primarily on the
             return standardize_response({
                 "answer_markdown": "NOT FOUND IN PROVIDED OPINIONS.\n\nNo verifiable excerpts were found in the ingested opinions that support an answer to your query. Try refining your question or ingesting additional opinions.",
                 "sources": [],
-                "debug": {
-                    "claims": [],
-                    "support_audit": {"total_claims": 0, "supported_claims": 0, "unsupported_claims": 1},
-                    "search_query": message,
-                    "search_terms": search_terms,
-                    "pages_count": len(pages),
-                    "pages_sample": [{"opinion_id": p.get("opinion_id"), "case_name": p.get("case_name"), "page_number": p.get("page_number")} for p in pages[:5]],
-                    "markers_count": len(markers),
-                    "markers": [{"opinion_id": m.get("opinion_id"), "page_number": m.get("page_number"), "quote_preview": (m.get("quote") or "")[:120], "position": m.get("position")} for m in markers[:10]],
-                    "sources_count": 0,
-                    "sources": [],
-                    "raw_response": raw_answer,
-                    "return_branch": "rejected_uncited_response"
-                }
+                "debug": _debug_envelope("rejected_uncited_response", search_query=message, search_terms=search_terms, pages=pages, markers=markers, raw_answer=raw_answer, unsupported_claims=1)
             })
         
         answer_markdown = build_answer_markdown(raw_answer, markers, position_to_sid)
@@ -4595,23 +5038,13 @@ If the user asked for the "latest" or "most recent" case, focus primarily on the
         answer_markdown = make_citations_clickable(answer_markdown, quote_registry, sources)
         answer_markdown = append_citation_appendix(answer_markdown, sources)
         
-        # Calculate citation metrics for telemetry (P1)
+        # Calculate citation metrics for telemetry (P1) and the debug claims in one pass
         total_citations = len(sources)
-        verified_citations = sum(1 for s in sources 
-                                  if s.get('citation_verification', {}).get('tier', s.get('tier', 'unverified')) 
-                                  in ('strong', 'moderate'))
-        unverified_citations = total_citations - verified_citations
-        unverified_rate = (unverified_citations / total_citations * 100) if total_citations > 0 else 0
-        
-        unsupported_statements = sum(1 for ss in statement_support if not ss.get('supported', True))
-        total_statements = len(statement_support)
-        
-        logging.info(f"CITATION_TELEMETRY: total={total_citations}, verified={verified_citations}, "
-                     f"unverified={unverified_citations} ({unverified_rate:.1f}%), "
-                     f"unsupported_statements={unsupported_statements}/{total_statements}")
-        
+        verified_citations = 0
         claims = []
         for i, s in enumerate(sources, 1):
+            if s.get('citation_verification', {}).get('tier', s.get('tier', 'unverified')) in ('strong', 'moderate'):
+                verified_citations += 1
             claims.append({
                 "id": i,
                 "text": s['quote'][:150],
@@ -4625,6 +5058,15 @@ If the user asked for the "latest" or "most recent" case, focus primarily on the
                     "verified": True
                 }]
             })
+        unverified_citations = total_citations - verified_citations
+        unverified_rate = (unverified_citations / total_citations * 100) if total_citations > 0 else 0
+        
+        unsupported_statements = sum(1 for ss in statement_support if not ss.get('supported', True))
+        total_statements = len(statement_support)
+        
+        logging.info(f"CITATION_TELEMETRY: total={total_citations}, verified={verified_citations}, "
+                     f"unverified={unverified_citations} ({unverified_rate:.1f}%), "
+                     f"unsupported_statements={unsupported_statements}/{total_statements}")
         
         # Build controlling authorities (separate from cited sources for provenance)
         controlling_authorities = build_controlling_authorities(pages, doctrine_tag)
@@ -4698,11 +5140,11 @@ If the user asked for the "latest" or "most recent" case, focus primarily on the
                 "search_query": message,
                 "search_terms": search_terms,
                 "pages_count": len(pages),
-                "pages_sample": [{"opinion_id": p.get("opinion_id"), "case_name": p.get("case_name"), "page_number": p.get("page_number")} for p in pages[:5]],
+                "pages_sample": _debug_pages_sample(pages),
                 "markers_count": len(markers),
-                "markers": [{"opinion_id": m.get("opinion_id"), "page_number": m.get("page_number"), "quote_preview": (m.get("quote") or "")[:120], "position": m.get("position")} for m in markers[:10]],
+                "markers": _debug_markers_sample(markers),
                 "sources_count": len(sources),
-                "sources": [{"sid": s.get("sid"), "opinion_id": s.get("opinion_id"), "page_number": s.get("page_number"), "quote": s.get("quote", "")[:120]} for s in sources[:10]],
+                "sources": _debug_sources_sample(sources),
                 "raw_response": raw_answer,
                 "return_branch": "ok",
                 "doctrine_tag": doctrine_tag,
@@ -4725,22 +5167,118 @@ If the user asked for the "latest" or "most recent" case, focus primarily on the
         return standardize_response({
             "answer_markdown": f"Error generating response: {str(e)}\n\nPlease try again.",
             "sources": [],
-            "debug": {
-                "claims": [],
-                "support_audit": {"total_claims": 0, "supported_claims": 0, "unsupported_claims": 1},
-                "search_query": message,
-                "search_terms": search_terms,
-                "pages_count": len(pages) if pages else 0,
-                "pages_sample": [{"opinion_id": p.get("opinion_id"), "case_name": p.get("case_name"), "page_number": p.get("page_number")} for p in (pages or [])[:5]],
-                "markers_count": 0,
-                "markers": [],
-                "sources_count": 0,
-                "sources": [],
-                "raw_response": None,
-                "error": str(e),
-                "return_branch": "exception"
-            }
+            "debug": _debug_envelope("exception", search_query=message, search_terms=search_terms, pages=pages, unsupported_claims=1, extras={"error": str(e)})
         })
+    finally:
+        # Don't leave a speculative web lookup running once the request has its answer
+        if web_lookup_task and not web_lookup_task.done():
+            web_lookup_task.cancel()
+
+
+# SSE token frame pieces; main.py's stream relay matches on '"type": "token"' verbatim
+_SSE_TOKEN_PREFIX = 'data: {"type": "token", "content": '
+_SSE_EVENT_END = '}\n\n'
+
+# Coalesce streamed deltas into frames of at least this many chars, or this old
+_SSE_FLUSH_CHARS = 64
+_SSE_FLUSH_SECONDS = 0.04
+
+class _TokenBatcher:
+    """Groups small LLM deltas into larger SSE payloads.
+    
+    The first delta is emitted on its own so time-to-first-token is unchanged; after
+    that a batch is flushed once it reaches _SSE_FLUSH_CHARS or _SSE_FLUSH_SECONDS.
+    """
+    
+    def __init__(self):
+        self._pending: List[str] = []
+        self._pending_len = 0
+        self._last_flush: Optional[float] = None
+    
+    def add(self, token: str) -> Optional[str]:
+        """Buffer a delta; returns a batch when one is due."""
+        self._pending.append(token)
+        self._pending_len += len(token)
+        now = time.monotonic()
+        if self._last_flush is None or self._pending_len >= _SSE_FLUSH_CHARS or now - self._last_flush >= _SSE_FLUSH_SECONDS:
+            self._last_flush = now
+            return self.flush()
+        return None
+    
+    def flush(self) -> Optional[str]:
+        if not self._pending:
+            return None
+        batch = "".join(self._pending)
+        self._pending = []
+        self._pending_len = 0
+        return batch
+
+def _coalesce_tokens(tokens: Iterable[str]) -> Iterator[str]:
+    """Group small LLM deltas into larger SSE payloads (see _TokenBatcher)."""
+    batcher = _TokenBatcher()
+    for token in tokens:
+        batch = batcher.add(token)
+        if batch is not None:
+            yield batch
+    rest = batcher.flush()
+    if rest is not None:
+        yield rest
+
+async def _coalesce_tokens_async(tokens: AsyncIterator[str]) -> AsyncIterator[str]:
+    """_coalesce_tokens over an async stream of deltas."""
+    batcher = _TokenBatcher()
+    async for token in tokens:
+        batch = batcher.add(token)
+        if batch is not None:
+            yield batch
+    rest = batcher.flush()
+    if rest is not None:
+        yield rest
+
+class _IncrementalMarkerScanner:
+    """Finds citation markers on completed lines of a response that is still streaming.
+    
+    Scanning starts once a CITATION_MAP header or legacy CITE comment has appeared, and
+    only text up to the last newline is parsed so a half-streamed quote is never read.
+    """
+    
+    _TRIGGERS = ("CITATION_MAP", "<!--CITE")
+    
+    def __init__(self):
+        self._active = False
+        self._tail = ""
+        self._seen: set = set()
+    
+    def feed(self, text: str, parts: List[str]) -> List[Dict]:
+        """Register newly streamed text; parts is everything streamed so far, text included."""
+        if not self._active:
+            window = (self._tail + text).upper()
+            self._active = any(t in window for t in self._TRIGGERS)
+            self._tail = window[-16:]
+        if not self._active or "\n" not in text:
+            return []
+        so_far = "".join(parts)
+        complete = so_far[:so_far.rfind("\n") + 1]
+        fresh = []
+        for marker in extract_cite_markers(complete):
+            key = (marker.get("opinion_id"), marker.get("page_number"), (marker.get("quote") or "")[:40])
+            if key not in self._seen:
+                self._seen.add(key)
+                fresh.append(marker)
+        return fresh
+
+def _json_text(obj: Any) -> str:
+    """Serialize to compact JSON text, using orjson when it is installed.
+    
+    Non-ASCII (section signs, curly quotes in case names) is emitted as UTF-8
+    rather than \\uXXXX escapes either way.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
 
 
 async def generate_chat_response_stream(
@@ -4756,29 +5294,28 @@ async def generate_chat_response_stream(
             'data: {"type": "sources", "sources": [...]}\n\n' at the end
             'data: {"type": "done"}\n\n' when complete
     """
-    import json
-    
     # First, do the search and context building (non-streaming part)
     search_terms = message.split()
+    loop = asyncio.get_running_loop()
     
     if opinion_ids:
         pages = []
-        for oid in opinion_ids:
-            opinion_pages = db.get_pages_for_opinion(oid)
+        for opinion_pages in await asyncio.gather(*(
+            loop.run_in_executor(_executor, db.get_pages_for_opinion, oid) for oid in opinion_ids
+        )):
             pages.extend(opinion_pages)
     else:
-        pages = db.search_pages(message, None, limit=20, party_only=party_only)
-        
-        # Fallback retrieval if needed
-        if len(pages) < 5 and len(message.split()) > 10:
-            short_query = " ".join(message.split()[:8])
-            more_pages = db.search_pages(short_query, None, limit=10, party_only=party_only)
-            seen_ids = {(p.get('opinion_id'), p.get('page_number')) for p in pages}
-            for p in more_pages:
-                key = (p.get('opinion_id'), p.get('page_number'))
-                if key not in seen_ids:
-                    pages.append(p)
-                    seen_ids.add(key)
+        search = loop.run_in_executor(_executor, lambda: db.search_pages(message, None, limit=20, party_only=party_only))
+        if len(search_terms) > 10:
+            # Long questions often match too narrowly; run the short-query fallback
+            # alongside the primary search and use it only if the primary comes back thin
+            short_query = " ".join(search_terms[:8])
+            fallback = loop.run_in_executor(_executor, lambda: db.search_pages(short_query, None, limit=10, party_only=party_only))
+            pages, more_pages = await asyncio.gather(search, fallback)
+            if len(pages) < 5:
+                pages, _ = _merge_dedup_pages(pages, more_pages, limit=None)
+        else:
+            pages = await search
     
     if not pages:
         # Try web search to find and ingest relevant cases
@@ -4820,23 +5357,21 @@ async def generate_chat_response_stream(
         yield 'data: {"type": "done"}\n\n'
         return
     
-    # Build context with parallel operations
-    loop = asyncio.get_event_loop()
-    context = await loop.run_in_executor(_executor, lambda: build_context(pages))
-    conv_summary = await loop.run_in_executor(_executor, lambda: build_conversation_summary(conversation_id))
+    # Build context and conversation summary in parallel
+    context, conv_summary = await asyncio.gather(
+        loop.run_in_executor(_executor, lambda: build_context(pages)),
+        loop.run_in_executor(_executor, lambda: build_conversation_summary(conversation_id)),
+    )
     
     # Check for cached legal definitions
-    cached_def = None
-    query_lower = message.lower()
-    if 'alice' in query_lower or 'mayo' in query_lower or '101' in query_lower:
-        cached_def = get_cached_legal_definition('alice_mayo')
-    elif 'obviousness' in query_lower or 'obvious' in query_lower or '103' in query_lower:
-        cached_def = get_cached_legal_definition('obviousness')
+    definition_key = legal_definition_key(message.lower())
+    cached_def = get_cached_legal_definition(definition_key) if definition_key else None
     
     # Build enhanced prompt
+    # Static SYSTEM_PROMPT first so the provider's prompt cache can reuse the prefix
     enhanced_prompt = SYSTEM_PROMPT
     if conv_summary:
-        enhanced_prompt = conv_summary + "\n" + enhanced_prompt
+        enhanced_prompt += "\n\n" + conv_summary
     if cached_def:
         enhanced_prompt += f"\n\nREFERENCE FRAMEWORK:\n{cached_def}"
     enhanced_prompt += "\n\nAVAILABLE OPINION EXCERPTS:\n" + context
@@ -4847,40 +5382,53 @@ async def generate_chat_response_stream(
     try:
         # Use streaming API
         stream_max_tokens = 2800 if len(message) < 220 else 3200  # Raised from 1800/2200
-        stream = client.chat.completions.create(
+        deltas = stream_content_deltas(
+            client,
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": enhanced_prompt},
                 {"role": "user", "content": message}
             ],
             temperature=0.15,
-            max_tokens=stream_max_tokens,
-            stream=True
+            max_tokens=stream_max_tokens
         )
+        response_parts = []
+        # Verify each citation as soon as its line completes and emit it as a preview
+        # "source" event; the final "sources" event below stays authoritative and, with
+        # verification memoized, mostly re-reads those results
+        marker_scanner = _IncrementalMarkerScanner()
+        previews = []
+        async for text in _coalesce_tokens_async(deltas):
+            response_parts.append(text)
+            yield _SSE_TOKEN_PREFIX + _json_text(text) + _SSE_EVENT_END
+            for marker in marker_scanner.feed(text, response_parts):
+                previews.append((marker, loop.run_in_executor(
+                    _executor, lambda m=marker: build_sources_from_markers([m], pages, search_terms)
+                )))
+            while previews and previews[0][1].done():
+                marker, future = previews.pop(0)
+                for source in (future.result()[0] if not future.exception() else []):
+                    yield 'data: {"type": "source", "citation_num": ' + _json_text(marker.get("citation_num")) + ', "source": ' + _json_text(source) + _SSE_EVENT_END
+        for _, future in previews:
+            future.cancel()
+        full_response = "".join(response_parts)
         
-        full_response = ""
-        for chunk in stream:
-            if chunk.choices and chunk.choices[0].delta.content:
-                token = chunk.choices[0].delta.content
-                full_response += token
-                # Escape for JSON
-                escaped_token = json.dumps(token)[1:-1]  # Remove quotes from json.dumps
-                yield f'data: {{"type": "token", "content": "{escaped_token}"}}\n\n'
-        
-        # Process the complete response to extract sources
+        # Process the complete response to extract sources. Keep this single full parse
+        # after the loop: inside it, a per-token re-parse of the growing text is quadratic
+        # (the preview scanner above only re-parses when a line completes)
         markers = extract_cite_markers(full_response)
-        sources, position_to_sid = build_sources_from_markers(markers, pages, search_terms)
+        sources, position_to_sid = await loop.run_in_executor(
+            _executor, lambda: build_sources_from_markers(markers, pages, search_terms)
+        )
         sources = curate_sources_for_mode(sources, attorney_mode)
         
         # Send sources at the end
-        sources_json = json.dumps(sources)
-        yield f'data: {{"type": "sources", "sources": {sources_json}}}\n\n'
+        yield 'data: {"type": "sources", "sources": ' + _json_text(sources) + _SSE_EVENT_END
         
         # Signal completion
         yield 'data: {"type": "done"}\n\n'
         
     except Exception as e:
         logging.error(f"Streaming error: {e}")
-        error_msg = json.dumps(str(e))[1:-1]
-        yield f'data: {{"type": "error", "message": "{error_msg}"}}\n\n'
+        yield 'data: {"type": "error", "message": ' + _json_text(str(e)) + _SSE_EVENT_END
         yield 'data: {"type": "done"}\n\n'
@@ -1,19 +1,40 @@
 import sqlite3
 import os
+import threading
 from contextlib import contextmanager
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import uuid
 from datetime import datetime
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "cafc.db")
 
+# Per-connection settings; journal_mode=WAL is also persisted in the database file
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
+
+_local = threading.local()
+
 def get_db_path():
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
     return DB_PATH
 
-def init_db():
-    conn = sqlite3.connect(get_db_path())
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(get_db_path(), check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def init_db():
+    with get_db() as conn:
+        _create_schema(conn)
+
+def _create_schema(conn: sqlite3.Connection):
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -100,16 +121,27 @@ def init_db():
         """)
     
     conn.commit()
-    conn.close()
 
 @contextmanager
 def get_db():
-    conn = sqlite3.connect(get_db_path())
-    conn.row_factory = sqlite3.Row
+    """Yield this thread's connection, opening it on first use.
+
+    The connection stays open for the life of the thread so the page cache
+    and pragmas survive between queries. When the outermost block exits, any
+    transaction the helper left uncommitted (including one that failed
+    mid-write) is rolled back, so it cannot hold the write lock or leak into
+    the next caller.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = _connect()
+    _local.depth = getattr(_local, "depth", 0) + 1
     try:
         yield conn
     finally:
-        conn.close()
+        _local.depth -= 1
+        if _local.depth == 0 and conn.in_transaction:
+            conn.rollback()
 
 def dict_from_row(row) -> Optional[Dict]:
     if row is None:
@@ -119,11 +151,13 @@ def dict_from_row(row) -> Optional[Dict]:
 def get_status() -> Dict[str, Any]:
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) as total FROM opinions")
-        total = cursor.fetchone()["total"]
-        cursor.execute("SELECT COUNT(*) as ingested FROM opinions WHERE ingested = 1")
-        ingested = cursor.fetchone()["ingested"]
-        return {"status": "ok", "opinions": {"total": total, "ingested": ingested}}
+        cursor.execute("""
+            SELECT COUNT(*) as total,
+                   COALESCE(SUM(CASE WHEN ingested = 1 THEN 1 ELSE 0 END), 0) as ingested
+            FROM opinions
+        """)
+        row = cursor.fetchone()
+        return {"status": "ok", "opinions": {"total": row["total"], "ingested": row["ingested"]}}
 
 def upsert_opinion(data: Dict) -> str:
     with get_db() as conn:
@@ -177,7 +211,7 @@ def get_opinions(q: Optional[str] = None, origin: Optional[str] = None, ingested
         
         query += " ORDER BY release_date DESC"
         cursor.execute(query, params)
-        return [dict_from_row(row) for row in cursor.fetchall()]
+        return list(map(dict, cursor.fetchall()))
 
 def get_opinion(opinion_id: str) -> Optional[Dict]:
     with get_db() as conn:
@@ -194,6 +228,15 @@ def insert_page(opinion_id: str, page_number: int, text: str):
         """, (opinion_id, page_number, text))
         conn.commit()
 
+def bulk_insert_pages(rows: List[Tuple[str, int, str]]):
+    """Insert (opinion_id, page_number, text) rows in a single transaction."""
+    with get_db() as conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO opinion_pages (opinion_id, page_number, text)
+            VALUES (?, ?, ?)
+        """, rows)
+        conn.commit()
+
 def mark_opinion_ingested(opinion_id: str, status: str = 'completed'):
     """
     Mark an opinion as ingested with a specific status.
@@ -210,11 +253,10 @@ def mark_opinion_ingested(opinion_id: str, status: str = 'completed'):
         cursor.execute("UPDATE opinions SET ingested = 1, updated_at = ?, status = ? WHERE id = ?", (now, status, opinion_id))
         conn.commit()
 
+_FTS_SPECIAL_CHARS = str.maketrans({c: ' ' for c in '?*+-(){}[]^"~:\\.,;!@#$%&/\''})
+
 def escape_fts_query(text: str) -> str:
-    special_chars = ['?', '*', '+', '-', '(', ')', '{', '}', '[', ']', '^', '"', '~', ':', '\\', '.', ',', ';', '!', '@', '#', '$', '%', '&', '/', "'"]
-    for char in special_chars:
-        text = text.replace(char, ' ')
-    return text
+    return text.translate(_FTS_SPECIAL_CHARS)
 
 def search_pages(query: str, opinion_ids: Optional[List[str]] = None, limit: int = 20) -> List[Dict]:
     with get_db() as conn:
@@ -224,7 +266,8 @@ def search_pages(query: str, opinion_ids: Optional[List[str]] = None, limit: int
         words = [w.strip() for w in safe_query.split() if w.strip()]
         if not words:
             return []
-        fts_query = " OR ".join(words)
+        # Quoted so words like AND/NOT are terms, not operators
+        terms = [f'"{w}"' for w in words]
         
         if opinion_ids:
             placeholders = ",".join("?" * len(opinion_ids))
@@ -239,7 +282,7 @@ def search_pages(query: str, opinion_ids: Optional[List[str]] = None, limit: int
                 ORDER BY rank
                 LIMIT ?
             """
-            params = [fts_query] + opinion_ids + [limit]
+            params = opinion_ids + [limit]
         else:
             sql = """
                 SELECT op.opinion_id, op.page_number, op.text,
@@ -251,10 +294,15 @@ def search_pages(query: str, opinion_ids: Optional[List[str]] = None, limit: int
                 ORDER BY rank
                 LIMIT ?
             """
-            params = [fts_query, limit]
+            params = [limit]
         
-        cursor.execute(sql, params)
-        return [dict_from_row(row) for row in cursor.fetchall()]
+        # Pages containing every term first; only widen to any term when none do
+        cursor.execute(sql, [" ".join(terms)] + params)
+        rows = cursor.fetchall()
+        if not rows and len(terms) > 1:
+            cursor.execute(sql, [" OR ".join(terms)] + params)
+            rows = cursor.fetchall()
+        return list(map(dict, rows))
 
 def create_conversation(title: str = "New Research") -> str:
     with get_db() as conn:
@@ -272,7 +320,7 @@ def get_conversations() -> List[Dict]:
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM conversations ORDER BY updated_at DESC")
-        return [dict_from_row(row) for row in cursor.fetchall()]
+        return list(map(dict, cursor.fetchall()))
 
 def get_conversation(conv_id: str) -> Optional[Dict]:
     with get_db() as conn:
@@ -297,7 +345,7 @@ def get_messages(conv_id: str) -> List[Dict]:
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM messages WHERE conversation_id = ? ORDER BY created_at", (conv_id,))
-        return [dict_from_row(row) for row in cursor.fetchall()]
+        return list(map(dict, cursor.fetchall()))
 
 def get_pages_for_opinion(opinion_id: str) -> List[Dict]:
     with get_db() as conn:
@@ -306,7 +354,7 @@ def get_pages_for_opinion(opinion_id: str) -> List[Dict]:
             "SELECT * FROM opinion_pages WHERE opinion_id = ? ORDER BY page_number",
             (opinion_id,)
         )
-        return [dict_from_row(row) for row in cursor.fetchall()]
+        return list(map(dict, cursor.fetchall()))
 
 def check_fts_health() -> Dict[str, Any]:
     with get_db() as conn:
@@ -2,11 +2,12 @@ import os
 import re
 import uuid
 import logging
+import threading
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from psycopg2.pool import ThreadedConnectionPool
+from psycopg2.pool import ThreadedConnectionPool, PoolError
 from contextlib import contextmanager
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 from datetime import datetime
 import hashlib
 
@@ -136,29 +137,54 @@ def build_or_tsquery(terms: List[str]) -> str:
     clean_terms = [re.sub(r'[^\w]', '', t) for t in terms if t.strip()]
     return ' | '.join(clean_terms)
 
+def build_terms_or_tsquery(terms: List[str]) -> str:
+    """Build a tsquery that matches ANY of the given terms.
+    
+    Multi-word terms keep their words ANDed together, as plainto_tsquery would:
+    ['claim construction', 'enablement'] -> (claim & construction) | (enablement)
+    """
+    groups = []
+    for term in terms:
+        words = [w for w in (re.sub(r'[^\w]', '', w) for w in term.split()) if w]
+        if words:
+            groups.append('(' + ' & '.join(words) + ')')
+    return ' | '.join(groups)
+
 # Global connection pool (initialize once, reuse connections)
 _pool = None
+POOL_MAXCONN = 10
+
+# ThreadedConnectionPool raises PoolError instead of waiting when every connection is
+# checked out. The chat executor, the event loop thread and default-executor threads all
+# draw from the pool, so callers queue on these slots for a free connection instead.
+_pool_slots = threading.BoundedSemaphore(POOL_MAXCONN)
+POOL_WAIT_SECONDS = 30.0
 
 def get_pool():
     global _pool
     if _pool is None:
         if not DATABASE_URL:
             raise RuntimeError("DATABASE_URL environment variable is not set")
-        _pool = ThreadedConnectionPool(1, 10, DATABASE_URL, cursor_factory=RealDictCursor)
+        _pool = ThreadedConnectionPool(1, POOL_MAXCONN, DATABASE_URL, cursor_factory=RealDictCursor)
     return _pool
 
 @contextmanager
 def get_db():
     pool = get_pool()
-    conn = pool.getconn()
+    if not _pool_slots.acquire(timeout=POOL_WAIT_SECONDS):
+        raise PoolError(f"no database connection free after {POOL_WAIT_SECONDS:.0f}s")
     try:
-        yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
+        conn = pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            pool.putconn(conn)
     finally:
-        pool.putconn(conn)
+        _pool_slots.release()
 
 def init_db():
     with get_db() as conn:
@@ -1038,6 +1064,34 @@ def normalize_case_name_query(query: str) -> str:
     return q
 
 
+def lookup_opinion_ids_by_names(case_names: List[str]) -> Dict[str, Optional[str]]:
+    """Resolve several case names to opinion ids in one query.
+    
+    Uses the same ILIKE match on the normalized name as search_pages(party_only=True),
+    restricted to ingested documents that have pages. Returns {case_name: opinion_id or None}.
+    """
+    if not case_names:
+        return {}
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT n.name,
+                   (SELECT d.id::text
+                    FROM documents d
+                    WHERE n.pattern <> ''
+                      AND d.ingested = TRUE
+                      AND d.case_name ILIKE '%%' || n.pattern || '%%'
+                      AND EXISTS (
+                        SELECT 1 FROM document_pages p
+                        WHERE p.document_id = d.id AND p.page_number <= 10
+                      )
+                    ORDER BY d.case_name
+                    LIMIT 1) as opinion_id
+            FROM unnest(%s::text[], %s::text[]) AS n(name, pattern)
+        """, (case_names, [normalize_case_name_query(name) for name in case_names]))
+        return {row["name"]: row["opinion_id"] for row in cursor.fetchall()}
+
+
 def find_most_recent_documents_by_name(party_name: str, limit: int = 2) -> List[str]:
     """Find the most recent document IDs matching a party name, sorted by date.
     
@@ -1261,6 +1315,66 @@ def search_pages(query: str, opinion_ids: Optional[List[str]] = None, limit: int
         return rows
 
 
+def search_pages_multi(terms: Iterable[str], opinion_ids: Optional[List[str]] = None, limit: int = 15, max_text_chars: int = 4000) -> List[Dict]:
+    """Search pages matching ANY of several terms in a single query.
+    
+    Replaces issuing one search_pages call per term: Postgres ranks the union
+    and each page comes back at most once.
+    
+    Args:
+        terms: Search terms; multi-word terms must match all of their words
+        opinion_ids: Optional list of specific opinion IDs to search within
+        limit: Max results
+        max_text_chars: Maximum characters to return per page text
+    """
+    terms = [t.strip() for t in terms if len(t.strip()) > 2]
+    tsquery = build_terms_or_tsquery(terms)
+    if not tsquery:
+        return []
+    
+    with get_db() as conn:
+        cursor = conn.cursor()
+        if opinion_ids:
+            cursor.execute("""
+                SELECT 
+                    p.document_id as opinion_id, p.page_number, LEFT(p.text, %s) as text,
+                    d.case_name, d.appeal_number as appeal_no, 
+                    to_char(d.release_date, 'YYYY-MM-DD') as release_date, d.pdf_url,
+                    d.courtlistener_url, d.origin,
+                    ts_rank(p.text_search_vector, q) as rank
+                FROM document_pages p
+                JOIN documents d ON p.document_id = d.id,
+                     to_tsquery('english', %s) q
+                WHERE d.id::text = ANY(%s)
+                  AND p.text_search_vector @@ q
+                ORDER BY rank DESC
+                LIMIT %s
+            """, (max_text_chars, tsquery, opinion_ids, limit))
+        else:
+            # Same case-name boost search_pages applies to a single term, for any of the terms
+            name_patterns = [f"%{t}%" for t in terms]
+            cursor.execute("""
+                SELECT 
+                    p.document_id as opinion_id, p.page_number, LEFT(p.text, %s) as text,
+                    d.case_name, d.appeal_number as appeal_no, 
+                    to_char(d.release_date, 'YYYY-MM-DD') as release_date, d.pdf_url,
+                    d.courtlistener_url, d.origin,
+                    (
+                        ts_rank(p.text_search_vector, q) +
+                        CASE WHEN d.case_name ILIKE ANY(%s) THEN 10.0 ELSE 0.0 END
+                    ) as rank
+                FROM document_pages p
+                JOIN documents d ON p.document_id = d.id,
+                     to_tsquery('english', %s) q
+                WHERE d.ingested = TRUE 
+                  AND d.status = 'completed'
+                  AND (p.text_search_vector @@ q OR d.case_name ILIKE ANY(%s))
+                ORDER BY rank DESC
+                LIMIT %s
+            """, (max_text_chars, name_patterns, tsquery, name_patterns, limit))
+        
+        return [dict(row) for row in cursor.fetchall()]
+
 def fetch_adjacent_pages(
     pages: List[Dict],
     window_size: int = 3,
@@ -1470,6 +1584,36 @@ def get_messages(conv_id: str) -> List[Dict]:
         cursor.execute("SELECT * FROM messages WHERE conversation_id = %s ORDER BY created_at", (conv_id,))
         return [dict(row) for row in cursor.fetchall()]
 
+def conversation_has_context(conv_id: str) -> bool:
+    """True once a conversation has more than one message or a pending disambiguation.
+    
+    A conversation holding only its just-stored first question carries nothing that
+    changes the next answer (no summary, no prior case, no pending choice).
+    """
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """SELECT EXISTS (SELECT 1 FROM messages WHERE conversation_id = %s OFFSET 1)
+                   OR EXISTS (SELECT 1 FROM conversations
+                              WHERE id = %s AND pending_disambiguation IS NOT NULL) AS has_context""",
+            (conv_id, conv_id)
+        )
+        row = cursor.fetchone()
+        return bool(row["has_context"]) if row else False
+
+def get_latest_cited_message_id(conv_id: str) -> Optional[str]:
+    """Id of the newest assistant message carrying citations, or None."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """SELECT id FROM messages
+               WHERE conversation_id = %s AND role = 'assistant' AND citations IS NOT NULL
+               ORDER BY created_at DESC LIMIT 1""",
+            (conv_id,)
+        )
+        row = cursor.fetchone()
+        return str(row["id"]) if row else None
+
 def delete_conversation(conv_id: str, user_id: Optional[str] = None) -> bool:
     """Delete a single conversation and its messages. Atomic operation."""
     with get_db() as conn:
@@ -146,6 +146,10 @@ def classify_document(pages_text: List[str], case_name: str) -> str:
     
     return 'completed'
 
+def extract_pages_text(pdf_path: str) -> List[str]:
+    reader = PdfReader(pdf_path)
+    return [page.extract_text() or "" for page in reader.pages]
+
 async def ingest_opinion(opinion_id: str) -> Dict[str, Any]:
     os.makedirs(PDF_DIR, exist_ok=True)
     pdf_path = os.path.join(PDF_DIR, f"{opinion_id}.pdf")
@@ -178,14 +182,9 @@ async def ingest_opinion(opinion_id: str) -> Dict[str, Any]:
         log_memory("after-download")
         
         log_progress(opinion_id, "extracting")
-        reader = PdfReader(pdf_path)
-        num_pages = len(reader.pages)
-        
-        pages_text = []
-        for page_num in range(num_pages):
-            page = reader.pages[page_num]
-            text = page.extract_text() or ""
-            pages_text.append(text)
+        # Reading and parsing the PDF is blocking disk and CPU work; keep it off the event loop
+        pages_text = await asyncio.to_thread(extract_pages_text, pdf_path)
+        num_pages = len(pages_text)
         
         validation = validate_extracted_text(pages_text, opinion_id)
         log_progress(opinion_id, "validated", validation)
@@ -194,18 +193,14 @@ async def ingest_opinion(opinion_id: str) -> Dict[str, Any]:
             log_progress(opinion_id, "validation_warning", {"issues": validation["issues"]})
         
         log_progress(opinion_id, "inserting", {"pages": num_pages})
-        inserted_pages = 0
-        page1_preview = ""
+        page1_preview = pages_text[0][:500].replace("\n", " ").strip() if pages_text else ""
         
-        for page_num, text in enumerate(pages_text):
-            if page_num == 0:
-                page1_preview = text[:500].replace("\n", " ").strip()
-            
-            db.insert_page(opinion_id, page_num + 1, text)
-            inserted_pages += 1
-            
-            if (page_num + 1) % 10 == 0:
-                log_memory(f"page-{page_num + 1}")
+        # One transaction for the whole opinion instead of a commit per page
+        await asyncio.to_thread(db.bulk_insert_pages, [
+            (opinion_id, page_num + 1, text) for page_num, text in enumerate(pages_text)
+        ])
+        inserted_pages = len(pages_text)
+        log_memory(f"page-{inserted_pages}")
         
         doc_status = classify_document(pages_text, opinion.get('case_name', ''))
         db.mark_opinion_ingested(opinion_id, status=doc_status)
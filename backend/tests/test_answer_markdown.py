@@ -0,0 +1,33 @@
+"""
+Tests for build_answer_markdown's marker rewriting.
+
+Legacy <!--CITE--> comments are replaced by their [sid] or dropped, and a
+CITATION_MAP block is stripped from the displayed answer.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.chat import build_answer_markdown, extract_cite_markers
+
+
+class TestBuildAnswerMarkdown:
+
+    def test_legacy_markers_spliced_by_position(self):
+        text = (
+            'Claims are ineligible.<!--CITE:op-1|4|"abstract idea"--> '
+            'Damages were remanded.<!--CITE:op-2|9|"reasonable royalty"-->'
+        )
+        markers = extract_cite_markers(text)
+        position_to_sid = {markers[0]["position"]: "1"}
+
+        result = build_answer_markdown(text, markers, position_to_sid)
+
+        assert result == "Claims are ineligible. [1] Damages were remanded."
+
+    def test_citation_map_block_removed(self):
+        text = "The claim fails. [1]\n\nCITATION_MAP:\n[1] A v. B (op-1) | Page 3 | \"a quote\"\n"
+        markers = extract_cite_markers(text)
+
+        assert build_answer_markdown(text, markers, {}) == "The claim fails. [1]"
@@ -0,0 +1,428 @@
+"""
+Tests for the request-path caches in backend/chat.py.
+
+These caches sit in front of LLM and database round trips, so the tests
+focus on two properties: hits skip the expensive call, and failures are
+never pinned in the cache.
+"""
+
+import asyncio
+import json
+import sys
+import os
+from types import SimpleNamespace
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend import chat
+
+
+class TestQueryExpansionCache:
+    """expand_query_cached memoizes by normalized query text."""
+
+    def setup_method(self):
+        chat._EXPANSION_CACHE.clear()
+
+    def test_normalized_queries_share_one_call(self, monkeypatch):
+        calls = []
+
+        async def fake_expand(query, client=None):
+            calls.append(query)
+            return ["later-developed technology", "enablement"]
+
+        monkeypatch.setattr(chat, "expand_query_with_legal_terms", fake_expand)
+
+        first = asyncio.run(chat.expand_query_cached("After-arising   technology"))
+        second = asyncio.run(chat.expand_query_cached("  after-arising technology "))
+
+        assert first == second == ["later-developed technology", "enablement"]
+        assert calls == ["after-arising technology"]
+
+    def test_failed_expansion_is_not_cached(self, monkeypatch):
+        results = [[], ["written description"]]
+
+        async def fake_expand(query, client=None):
+            return results.pop(0)
+
+        monkeypatch.setattr(chat, "expand_query_with_legal_terms", fake_expand)
+
+        assert asyncio.run(chat.expand_query_cached("nascent technology")) == []
+        assert asyncio.run(chat.expand_query_cached("nascent technology")) == ["written description"]
+
+    def test_expansion_goes_through_the_limited_async_helper(self, monkeypatch):
+        calls = []
+
+        async def fake_create(client, **kwargs):
+            calls.append(kwargs["max_tokens"])
+            message = SimpleNamespace(content="enablement\nwritten description\n")
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        monkeypatch.setattr(chat, "create_chat_completion", fake_create)
+
+        terms = asyncio.run(chat.expand_query_with_legal_terms("after-arising technology", client=object()))
+
+        assert terms == ["enablement", "written description"]
+        assert calls == [150]
+
+
+class _FakeConversationDB:
+    """Minimal stand-in for the two message queries get_previous_case_context uses."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.get_messages_calls = 0
+
+    def get_latest_cited_message_id(self, conv_id):
+        cited = [m for m in self.messages if m["role"] == "assistant" and m.get("citations")]
+        return cited[-1]["id"] if cited else None
+
+    def get_messages(self, conv_id):
+        self.get_messages_calls += 1
+        return list(self.messages)
+
+
+def _assistant(msg_id, opinion_id, case_name):
+    return {
+        "id": msg_id,
+        "role": "assistant",
+        "citations": json.dumps({"sources": [{"opinion_id": opinion_id, "case_name": case_name}]}),
+    }
+
+
+class TestCaseContextCache:
+    """get_previous_case_context reuses its result until a new cited message arrives."""
+
+    def setup_method(self):
+        chat._CASE_CONTEXT_CACHE.clear()
+
+    def test_user_turns_reuse_cached_context(self, monkeypatch):
+        fake = _FakeConversationDB([
+            {"id": "m1", "role": "user", "citations": None},
+            _assistant("m2", "op-1", "Phillips v. AWH Corp."),
+        ])
+        monkeypatch.setattr(chat, "db", fake)
+
+        first = chat.get_previous_case_context("conv-1")
+        fake.messages.append({"id": "m3", "role": "user", "citations": None})
+        second = chat.get_previous_case_context("conv-1")
+
+        assert first == second
+        assert first["opinion_id"] == "op-1"
+        assert fake.get_messages_calls == 1
+
+    def test_new_cited_message_invalidates(self, monkeypatch):
+        fake = _FakeConversationDB([_assistant("m1", "op-1", "Phillips v. AWH Corp.")])
+        monkeypatch.setattr(chat, "db", fake)
+
+        assert chat.get_previous_case_context("conv-2")["opinion_id"] == "op-1"
+        fake.messages.append(_assistant("m2", "op-2", "Alice Corp. v. CLS Bank"))
+        assert chat.get_previous_case_context("conv-2")["opinion_id"] == "op-2"
+        assert fake.get_messages_calls == 2
+
+
+class TestWebSearchCache:
+    """find_cases_cached shares one Tavily round trip per normalized query."""
+
+    def setup_method(self):
+        chat._WEB_SEARCH_CACHE.clear()
+        chat._WEB_SEARCH_LOCKS.clear()
+
+    def _fake_search(self, monkeypatch, result):
+        calls = []
+
+        async def fake_find(query, local_results, confidence_threshold):
+            calls.append(query)
+            await asyncio.sleep(0)
+            return result
+
+        monkeypatch.setattr(chat.web_search, "find_and_prepare_cases", fake_find)
+        return calls
+
+    def test_concurrent_identical_queries_share_one_call(self, monkeypatch):
+        calls = self._fake_search(monkeypatch, {"web_search_triggered": True, "success": True, "cases_to_ingest": []})
+
+        async def run():
+            return await asyncio.gather(
+                chat.find_cases_cached("Nautilus  indefiniteness"),
+                chat.find_cases_cached("nautilus indefiniteness "),
+            )
+
+        first, second = asyncio.run(run())
+        assert first is second
+        assert len(calls) == 1
+
+    def test_failed_search_is_not_cached(self, monkeypatch):
+        calls = self._fake_search(monkeypatch, {"web_search_triggered": True, "success": False})
+
+        asyncio.run(chat.find_cases_cached("nautilus"))
+        asyncio.run(chat.find_cases_cached("nautilus"))
+        assert len(calls) == 2
+
+
+class TestSpeculativeWebLookup:
+    """Weak retrieval starts only the case lookup early; ingestion waits for NOT FOUND."""
+
+    CASE_FOUND = {"web_search_triggered": True, "success": True,
+                  "cases_to_ingest": [{"cluster_id": "123", "case_name": "Nautilus v. Biosig"}]}
+
+    def setup_method(self):
+        chat._WEB_SEARCH_CACHE.clear()
+        chat._WEB_SEARCH_LOCKS.clear()
+
+    def _fake_web(self, monkeypatch):
+        searched, ingested = [], []
+
+        async def fake_find(query, local_results, confidence_threshold):
+            searched.append(query)
+            return self.CASE_FOUND
+
+        async def fake_ingest_from_url(**kwargs):
+            ingested.append(kwargs["cluster_id"])
+            return {"success": False, "status": "failed", "error": "offline"}
+
+        monkeypatch.setattr(chat.web_search, "find_and_prepare_cases", fake_find)
+        monkeypatch.setattr(chat.db, "check_document_exists_by_cluster_id", lambda cluster_id: None)
+        monkeypatch.setitem(sys.modules, "backend.ingest", SimpleNamespace(ingest_document_from_url=fake_ingest_from_url))
+        return searched, ingested
+
+    def test_only_low_confidence_speculates(self):
+        assert chat.start_web_lookup("nautilus", chat.RetrievalConfidence.MODERATE) is None
+
+    def test_usable_answer_does_not_start_an_ingest(self, monkeypatch):
+        searched, ingested = self._fake_web(monkeypatch)
+
+        async def run():
+            task = chat.start_web_lookup("nautilus", chat.RetrievalConfidence.LOW)
+            await asyncio.sleep(0.01)  # the LLM call answers after the lookup finished
+            task.cancel()
+
+        asyncio.run(run())
+        assert searched == ["nautilus"]
+        assert ingested == []
+
+    def test_not_found_ingests_from_the_speculative_lookup(self, monkeypatch):
+        searched, ingested = self._fake_web(monkeypatch)
+
+        async def run():
+            task = chat.start_web_lookup("nautilus", chat.RetrievalConfidence.LOW)
+            return await chat.web_search_fallback("nautilus", None, task)
+
+        result = asyncio.run(run())
+        assert searched == ["nautilus"]
+        assert ingested == ["123"]
+        assert result["cases_found"] == ["Nautilus v. Biosig"]
+
+
+class TestVerificationNormalizationCache:
+    """A page is normalized once however many quotes are verified against it."""
+
+    def setup_method(self):
+        chat.normalize_for_verification.cache_clear()
+        chat._punct_free_variant.cache_clear()
+        chat.verify_quote_with_normalization_variants.cache_clear()
+
+    def test_page_normalized_once_across_quotes(self):
+        page_text = "The claims are directed to an abstract idea and are therefore ineligible under section 101. " * 5
+        quotes = [
+            "directed to an abstract idea and are therefore ineligible",
+            "this sentence never appears anywhere on the page at all",
+            "are therefore ineligible under section 101",
+        ]
+
+        results = [chat.verify_quote_strict(q, page_text) for q in quotes]
+
+        assert results == [True, False, True]
+        # one miss for the page plus one per quote
+        assert chat.normalize_for_verification.cache_info().misses == 1 + len(quotes)
+
+    def test_case_level_fallback_reuses_strict_pass_results(self):
+        pages = [
+            {"opinion_id": "op-1", "page_number": n, "text": f"Page {n} discusses claim construction under Phillips at length."}
+            for n in (1, 2, 3)
+        ]
+
+        page, method, _ = chat.verify_quote_with_case_binding(
+            "a sentence that the opinion never actually contains", "op-1", pages
+        )
+
+        assert page is None and method == "failed"
+        assert chat.verify_quote_with_normalization_variants.cache_info().misses == len(pages)
+
+
+class TestBuildContextCache:
+    """build_context reuses a built context for the same pages and text."""
+
+    def setup_method(self):
+        chat._CONTEXT_CACHE.clear()
+
+    def _pages(self, text="The claims are invalid."):
+        return [{"opinion_id": "op-1", "case_name": "A v. B", "appeal_no": "20-1", "release_date": "2021-01-01",
+                 "page_number": 3, "text": text}]
+
+    def test_same_pages_hit_cache(self, monkeypatch):
+        built = []
+        monkeypatch.setattr(chat, "_build_context_uncached", lambda pages, max_tokens: built.append(1) or "ctx")
+
+        chat.build_context(self._pages())
+        chat.build_context(self._pages())
+        assert len(built) == 1
+
+    def test_changed_text_misses_cache(self, monkeypatch):
+        built = []
+        monkeypatch.setattr(chat, "_build_context_uncached", lambda pages, max_tokens: built.append(1) or "ctx")
+
+        chat.build_context(self._pages())
+        chat.build_context(self._pages("The claims are valid."))
+        assert len(built) == 2
+
+    def test_overlapping_page_sets_count_each_page_once(self, monkeypatch):
+        chat._page_excerpt.cache_clear()
+        counted = []
+        monkeypatch.setattr(chat, "count_tokens", lambda text: counted.append(text) or 10)
+        first, second = self._pages("Page one."), self._pages("Page two.")
+        second[0]["page_number"] = 4
+
+        chat.build_context(first)
+        chat.build_context(first + second)
+        assert len(counted) == 2
+
+
+class TestContextPageArtifacts:
+    """Context excerpts drop PDF boilerplate without changing what quotes verify against."""
+
+    PAGE = ("Case: 2020-1234 Document: 69 Page: 12 Filed: 01/15/2021\n"
+            "GOOGLE LLC v. ORACLE AMERICA, INC.\n12\n"
+            "The claims are directed to an abstract idea under Alice,\n"
+            "and the district court correctly held them ineligible.\n2020-1234\n")
+
+    def test_boilerplate_removed_and_normalization_unchanged(self):
+        stripped = chat._strip_page_artifacts(self.PAGE)
+
+        assert "Document: 69" not in stripped and "ORACLE" not in stripped
+        assert "abstract idea under Alice" in stripped
+        assert chat.normalize_for_verification(stripped) == chat.normalize_for_verification(self.PAGE)
+
+
+class TestLegalDefinitionKey:
+    """legal_definition_key keeps the original if/elif priority order."""
+
+    def test_priority_follows_definition_order_not_text_order(self):
+        assert chat.legal_definition_key("obviousness under 103 and alice") == "alice_mayo"
+
+    def test_substring_triggers(self):
+        assert chat.legal_definition_key("is the claim nonobvious") == "obviousness"
+        assert chat.legal_definition_key("phillips and claim construction") == "claim_construction"
+        assert chat.legal_definition_key("standard for enhanced damages") == "willful_infringement"
+
+    def test_no_trigger(self):
+        assert chat.legal_definition_key("what is the holding") is None
+
+
+class TestMarkerPageFetches:
+    """build_sources_from_markers fetches each (opinion, page) from the DB at most once."""
+
+    def test_unbound_markers_share_fetches(self, monkeypatch):
+        fetches = []
+
+        class FakeDB:
+            def get_page_text(self, opinion_id, page_number):
+                fetches.append((opinion_id, page_number))
+                return {"opinion_id": opinion_id, "page_number": page_number, "case_name": "A v. B",
+                        "text": "Nothing on this page resembles the quoted sentence at all."}
+
+        monkeypatch.setattr(chat, "db", FakeDB())
+        marker = {"opinion_id": "op-1", "case_name": "A v. B", "page_number": 4,
+                  "quote": "a holding that the opinion never actually states anywhere", "position": 0}
+
+        sources, _ = chat.build_sources_from_markers([marker, dict(marker, position=50)], [])
+
+        assert [s["tier"] for s in sources] == ["unverified", "unverified"]
+        assert sorted(fetches) == [("op-1", 3), ("op-1", 4), ("op-1", 5), ("op-1", 6)]
+
+
+class TestResponseCache:
+    """Stateless repeats of a grounded answer skip the whole pipeline."""
+
+    def setup_method(self):
+        chat._RESPONSE_CACHE.clear()
+
+    def _fake_pipeline(self, monkeypatch, branch="ok"):
+        calls = []
+
+        async def fake_generate(message, opinion_ids, conversation_id, party_only, attorney_mode):
+            calls.append(message)
+            return {"answer_markdown": f"answer {len(calls)}", "sources": [], "return_branch": branch}
+
+        monkeypatch.setattr(chat, "_generate_chat_response", fake_generate)
+        return calls
+
+    def test_repeat_question_is_cached(self, monkeypatch):
+        calls = self._fake_pipeline(monkeypatch)
+
+        first = asyncio.run(chat.generate_chat_response("What is  Alice step two?"))
+        first["answer_markdown"] = "mutated by caller"
+        second = asyncio.run(chat.generate_chat_response("what is alice step two?"))
+
+        assert second["answer_markdown"] == "answer 1"
+        assert len(calls) == 1
+
+    def test_conversation_with_history_and_no_cache_bypass(self, monkeypatch):
+        calls = self._fake_pipeline(monkeypatch)
+        monkeypatch.setattr(chat.db, "conversation_has_context", lambda conv_id: True, raising=False)
+
+        asyncio.run(chat.generate_chat_response("What is Alice step two?"))
+        asyncio.run(chat.generate_chat_response("What is Alice step two?", conversation_id="conv-1"))
+        asyncio.run(chat.generate_chat_response("What is Alice step two?", no_cache=True))
+        assert len(calls) == 3
+
+    def test_first_turn_of_a_conversation_is_cached(self, monkeypatch):
+        calls = self._fake_pipeline(monkeypatch)
+        monkeypatch.setattr(chat.db, "conversation_has_context", lambda conv_id: False, raising=False)
+
+        asyncio.run(chat.generate_chat_response("What is Alice step two?", conversation_id="conv-1"))
+        second = asyncio.run(chat.generate_chat_response("What is Alice step two?", conversation_id="conv-2"))
+
+        assert second["answer_markdown"] == "answer 1"
+        assert len(calls) == 1
+
+    def test_state_lookup_failure_bypasses_cache(self, monkeypatch):
+        calls = self._fake_pipeline(monkeypatch)
+
+        def broken(conv_id):
+            raise RuntimeError("db down")
+
+        monkeypatch.setattr(chat.db, "conversation_has_context", broken, raising=False)
+
+        asyncio.run(chat.generate_chat_response("What is Alice step two?", conversation_id="conv-1"))
+        asyncio.run(chat.generate_chat_response("What is Alice step two?", conversation_id="conv-1"))
+        assert len(calls) == 2
+
+    def test_ungrounded_answers_are_not_cached(self, monkeypatch):
+        calls = self._fake_pipeline(monkeypatch, branch="not_found_case_specific_no_pages")
+
+        asyncio.run(chat.generate_chat_response("Holding of Foo v. Bar?"))
+        asyncio.run(chat.generate_chat_response("Holding of Foo v. Bar?"))
+        assert len(calls) == 2
+
+
+class TestBatchChatResponses:
+    """generate_chat_responses fans questions out concurrently and keeps their order."""
+
+    def setup_method(self):
+        chat._RESPONSE_CACHE.clear()
+
+    def test_concurrent_and_ordered(self, monkeypatch):
+        active, peak = [0], [0]
+
+        async def fake_generate(message, opinion_ids, conversation_id, party_only, attorney_mode):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.01 if message == "slow" else 0)
+            active[0] -= 1
+            return {"answer_markdown": message, "sources": [], "return_branch": "ok"}
+
+        monkeypatch.setattr(chat, "_generate_chat_response", fake_generate)
+
+        results = asyncio.run(chat.generate_chat_responses(["slow", "fast", "third"]))
+
+        assert [r["answer_markdown"] for r in results] == ["slow", "fast", "third"]
+        assert peak[0] == 3
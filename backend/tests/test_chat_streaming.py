@@ -0,0 +1,289 @@
+"""
+Tests for streamed LLM completions in backend/chat.py.
+
+Uses a fake OpenAI client that yields chat.completion.chunk-shaped objects,
+so no network access or API key is needed.
+"""
+
+import asyncio
+import json
+import sys
+import os
+from types import SimpleNamespace
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend import chat
+from backend.chat import stream_completion_until_not_found
+
+
+class _FakeStream:
+    def __init__(self, pieces, finish_reason="stop"):
+        self.pieces = pieces
+        self.finish_reason = finish_reason
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for i, piece in enumerate(self.pieces):
+            self.consumed += 1
+            last = i == len(self.pieces) - 1
+            yield SimpleNamespace(choices=[SimpleNamespace(
+                delta=SimpleNamespace(content=piece),
+                finish_reason=self.finish_reason if last else None,
+            )])
+
+    def close(self):
+        self.closed = True
+
+
+def _client_for(stream):
+    create = lambda **kwargs: stream
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+class TestStreamCompletionUntilNotFound:
+
+    def test_full_answer_is_collected(self):
+        stream = _FakeStream(["The court ", "held that ", "the claims are invalid."], finish_reason="length")
+        text, finish_reason = stream_completion_until_not_found(_client_for(stream), model="m", messages=[])
+
+        assert text == "The court held that the claims are invalid."
+        assert finish_reason == "length"
+        assert stream.closed
+
+    def test_not_found_refusal_stops_early(self):
+        stream = _FakeStream(["NOT FOUND ", "IN PROVIDED ", "OPINIONS.", "\n\nLong explanation", " that is never read"])
+        text, finish_reason = stream_completion_until_not_found(_client_for(stream), model="m", messages=[])
+
+        assert text.startswith("NOT FOUND IN PROVIDED OPINIONS")
+        assert finish_reason == "not_found"
+        assert stream.consumed == 3
+        assert stream.closed
+
+    def test_not_found_caveat_later_in_answer_does_not_stop(self):
+        stream = _FakeStream(["Under Phillips, the ", "term is construed... ", "NOT FOUND IN PROVIDED OPINIONS: damages."])
+        text, finish_reason = stream_completion_until_not_found(_client_for(stream), model="m", messages=[])
+
+        assert text.endswith("damages.")
+        assert finish_reason == "stop"
+
+
+class _FakeAsyncStream(_FakeStream):
+    async def __aiter__(self):
+        for chunk in _FakeStream.__iter__(self):
+            yield chunk
+
+    async def close(self):
+        self.closed = True
+
+
+def _async_client_for(stream):
+    async def create(**kwargs):
+        return stream
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+class TestStreamCompletionUntilNotFoundAsync:
+
+    def test_async_client_stops_early(self, monkeypatch):
+        stream = _FakeAsyncStream(["NOT FOUND IN PROVIDED OPINIONS.", " more", " text"])
+        monkeypatch.setattr(chat, "get_async_openai_client", lambda: _async_client_for(stream))
+
+        text, finish_reason = asyncio.run(chat.stream_completion_until_not_found_async(None, model="m", messages=[]))
+
+        assert finish_reason == "not_found"
+        assert stream.consumed == 1
+        assert stream.closed
+
+    def test_falls_back_to_sync_client(self, monkeypatch):
+        stream = _FakeStream(["The court ", "affirmed."])
+        monkeypatch.setattr(chat, "get_async_openai_client", lambda: None)
+
+        text, finish_reason = asyncio.run(chat.stream_completion_until_not_found_async(_client_for(stream), model="m", messages=[]))
+
+        assert text == "The court affirmed."
+        assert finish_reason == "stop"
+
+
+class TestStreamContentDeltas:
+
+    async def _collect(self, client):
+        return [d async for d in chat.stream_content_deltas(client, model="m", messages=[])]
+
+    def test_async_client_deltas(self, monkeypatch):
+        stream = _FakeAsyncStream(["The court ", "", "affirmed."])
+        monkeypatch.setattr(chat, "get_async_openai_client", lambda: _async_client_for(stream))
+
+        assert asyncio.run(self._collect(None)) == ["The court ", "affirmed."]
+        assert stream.closed
+
+    def test_sync_fallback_deltas(self, monkeypatch):
+        stream = _FakeStream(["The court ", "reversed."])
+        monkeypatch.setattr(chat, "get_async_openai_client", lambda: None)
+
+        assert asyncio.run(self._collect(_client_for(stream))) == ["The court ", "reversed."]
+        assert stream.closed
+
+
+class TestAsyncClientPerLoop:
+    """get_async_openai_client never hands a client to a loop other than the one it was built on."""
+
+    def test_one_client_per_loop(self, monkeypatch):
+        monkeypatch.setattr(chat, "AI_BASE_URL", "http://127.0.0.1:9/v1")
+        monkeypatch.setattr(chat, "AI_API_KEY", "test-key")
+        monkeypatch.setattr(chat, "_async_openai_clients", chat.weakref.WeakKeyDictionary())
+
+        async def two_lookups():
+            return chat.get_async_openai_client(), chat.get_async_openai_client()
+
+        first_a, first_b = asyncio.run(two_lookups())
+        second, _ = asyncio.run(two_lookups())
+
+        assert first_a is first_b
+        assert second is not first_a
+
+class TestOpenAIRateLimiter:
+    """_OpenAIRateLimiter caps in-flight calls and spaces them to the per-minute budgets."""
+
+    def test_concurrency_cap(self):
+        limiter = chat._OpenAIRateLimiter(2)
+        active, peak = [0], [0]
+
+        async def call():
+            async with limiter.slot():
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                await asyncio.sleep(0.01)
+                active[0] -= 1
+
+        async def run():
+            await asyncio.gather(*(call() for _ in range(5)))
+
+        asyncio.run(run())
+        assert peak[0] == 2
+
+    def test_saturated_limiter_works_on_a_later_loop(self):
+        limiter = chat._OpenAIRateLimiter(1)
+
+        async def contend():
+            async def call():
+                async with limiter.slot():
+                    await asyncio.sleep(0)
+            await asyncio.gather(call(), call())
+
+        asyncio.run(contend())
+        asyncio.run(contend())
+
+    def test_token_budget_waits_for_refill(self, monkeypatch):
+        limiter = chat._OpenAIRateLimiter(4, tokens_per_minute=600)
+        waits = []
+
+        async def fake_sleep(seconds):
+            waits.append(seconds)
+            limiter._refilled_at -= seconds  # let the budget refill as if time had passed
+
+        async def run():
+            async with limiter.slot(600):
+                pass
+            monkeypatch.setattr(chat.asyncio, "sleep", fake_sleep)
+            async with limiter.slot(300):
+                pass
+
+        asyncio.run(run())
+        assert len(waits) == 1 and 29.9 < waits[0] <= 30.0
+
+    def test_estimate_counts_prompt_and_completion_budget(self):
+        kwargs = {"messages": [{"role": "system", "content": "x" * 400}, {"role": "user", "content": "y" * 40}],
+                  "max_tokens": 1000}
+        assert chat._estimate_request_tokens(kwargs) == 110 + 1000
+
+
+class TestSseTokenFrame:
+
+    def test_frame_round_trips_through_relay_parsing(self):
+        token = 'He said "hold"\n\u00a7 101 \\ done'
+        frame = chat._SSE_TOKEN_PREFIX + chat._json_text(token) + chat._SSE_EVENT_END
+
+        # backend/main.py relays frames by substring match, then json.loads
+        assert '"type": "token"' in frame
+        assert frame.endswith("\n\n")
+        data = json.loads(frame.replace('data: ', '', 1).strip())
+        assert data == {"type": "token", "content": token}
+
+    def test_non_ascii_is_not_escaped_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(chat, "orjson", None)
+        text = chat._json_text({"case_name": "Amgen Inc. v. Sanofi \u2014 \u201cgenus\u201d"})
+
+        assert "\\u" not in text
+        assert json.loads(text) == {"case_name": "Amgen Inc. v. Sanofi \u2014 \u201cgenus\u201d"}
+
+    def test_orjson_type_error_falls_back_to_compact_utf8(self, monkeypatch):
+        def refuse(obj):
+            raise TypeError("Type is not JSON serializable")
+
+        monkeypatch.setattr(chat, "orjson", SimpleNamespace(dumps=refuse))
+        text = chat._json_text({"case_name": "\u00a7 101", "pages": [1, 2]})
+
+        assert text == '{"case_name":"\u00a7 101","pages":[1,2]}'
+
+
+class TestCoalesceTokens:
+
+    def test_first_token_alone_then_batched(self, monkeypatch):
+        monkeypatch.setattr(chat.time, "monotonic", lambda: 100.0)
+        tokens = ["The"] + ["x" * 10] * 13
+
+        batches = list(chat._coalesce_tokens(tokens))
+
+        assert batches[0] == "The"
+        assert "".join(batches) == "".join(tokens)
+        assert all(len(b) >= chat._SSE_FLUSH_CHARS for b in batches[1:-1])
+        assert len(batches) == 3
+
+    def test_stale_batch_flushes_on_time(self, monkeypatch):
+        clock = iter([0.0, 0.01, 0.05, 0.06])
+        monkeypatch.setattr(chat.time, "monotonic", lambda: next(clock))
+
+        assert list(chat._coalesce_tokens(["a", "b", "c", "d"])) == ["a", "bc", "d"]
+
+    def test_async_matches_sync(self, monkeypatch):
+        monkeypatch.setattr(chat.time, "monotonic", lambda: 100.0)
+        tokens = ["The"] + ["x" * 10] * 13
+
+        async def deltas():
+            for token in tokens:
+                yield token
+
+        async def collect():
+            return [b async for b in chat._coalesce_tokens_async(deltas())]
+
+        assert asyncio.run(collect()) == list(chat._coalesce_tokens(tokens))
+
+
+class TestIncrementalMarkerScanner:
+
+    def _feed_all(self, pieces):
+        scanner = chat._IncrementalMarkerScanner()
+        parts, found = [], []
+        for piece in pieces:
+            parts.append(piece)
+            found.append([m["citation_num"] for m in scanner.feed(piece, parts)])
+        return found
+
+    def test_markers_surface_once_their_line_completes(self):
+        pieces = [
+            "The court construed the term [1].\n\n",
+            "CITATION_MAP:\n[1] Phillips v. AWH (op-1) | Page 3 | \"the words of a claim are generally",
+            " given their ordinary and customary meaning\"\n[2] Alice v. CLS (op-2) | Page 7 | \"abstract",
+            " idea\"\n",
+        ]
+
+        assert self._feed_all(pieces) == [[], [], [1], [2]]
+
+    def test_prose_newlines_before_the_map_are_not_parsed(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(chat, "extract_cite_markers", lambda text: calls.append(text) or [])
+
+        self._feed_all(["First paragraph.\n", "Second paragraph.\n", "CITATION_", "MAP:\n"])
+
+        assert len(calls) == 1
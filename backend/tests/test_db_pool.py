@@ -0,0 +1,73 @@
+"""
+Tests for connection checkout in backend/db_postgres.py.
+
+psycopg2's ThreadedConnectionPool raises PoolError when exhausted, so get_db
+queues callers on a slot semaphore instead. A fake pool stands in for Postgres.
+"""
+
+import threading
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import pytest
+from psycopg2.pool import PoolError
+
+from backend import db_postgres
+
+
+class _FakeConn:
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class _FakePool:
+    def __init__(self):
+        self.checked_out = 0
+
+    def getconn(self):
+        self.checked_out += 1
+        return _FakeConn()
+
+    def putconn(self, conn):
+        self.checked_out -= 1
+
+
+@pytest.fixture
+def one_slot_pool(monkeypatch):
+    pool = _FakePool()
+    monkeypatch.setattr(db_postgres, "_pool", pool)
+    monkeypatch.setattr(db_postgres, "_pool_slots", threading.BoundedSemaphore(1))
+    return pool
+
+
+class TestGetDbCheckout:
+
+    def test_exhausted_pool_waits_for_a_release(self, one_slot_pool):
+        done = threading.Event()
+
+        def second_caller():
+            with db_postgres.get_db():
+                done.set()
+
+        with db_postgres.get_db():
+            waiter = threading.Thread(target=second_caller)
+            waiter.start()
+            time.sleep(0.05)
+            assert not done.is_set()
+        waiter.join(1)
+
+        assert done.is_set()
+        assert one_slot_pool.checked_out == 0
+
+    def test_times_out_with_pool_error(self, one_slot_pool, monkeypatch):
+        monkeypatch.setattr(db_postgres, "POOL_WAIT_SECONDS", 0.01)
+
+        with db_postgres.get_db():
+            with pytest.raises(PoolError):
+                with db_postgres.get_db():
+                    pass
@@ -0,0 +1,66 @@
+"""
+Tests for _merge_dedup_pages, the shared named-case/search-result merge,
+and _debug_envelope, the shared debug payload for sourceless returns.
+
+Named case pages must always lead the merged list and never be displaced
+by a duplicate from the secondary results.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.chat import _debug_envelope, _merge_dedup_pages
+
+
+def _page(opinion_id, page_number, tag=""):
+    return {"opinion_id": opinion_id, "page_number": page_number, "tag": tag}
+
+
+class TestMergeDedupPages:
+    """Primary pages win, order is preserved, and the limit applies after merging."""
+
+    def test_primary_first_and_duplicates_dropped(self):
+        primary = [_page("a", 1, "named"), _page("a", 1, "dup"), _page("b", 2, "named")]
+        secondary = [_page("b", 2, "search"), _page("c", 3, "search")]
+
+        pages, primary_count = _merge_dedup_pages(primary, secondary)
+
+        assert [(p["opinion_id"], p["tag"]) for p in pages] == [("a", "named"), ("b", "named"), ("c", "search")]
+        assert primary_count == 2
+
+    def test_limit(self):
+        primary = [_page("a", n) for n in range(10)]
+        secondary = [_page("b", n) for n in range(10)]
+
+        pages, primary_count = _merge_dedup_pages(primary, secondary)
+        assert len(pages) == 15
+        assert primary_count == 10
+
+        pages, _ = _merge_dedup_pages(primary, secondary, limit=None)
+        assert len(pages) == 20
+
+
+class TestDebugEnvelope:
+    """_debug_envelope keeps the debug schema of the sourceless return branches."""
+
+    def test_schema_and_extras(self):
+        pages = [_page("a", n) for n in range(8)]
+        markers = [{"opinion_id": "a", "page_number": 1, "quote": "q", "position": 0}]
+
+        debug = _debug_envelope("rejected_uncited_response", search_query="q", search_terms=["t"],
+                                pages=pages, markers=markers, raw_answer="raw", unsupported_claims=1,
+                                extras={"query_type": "case_specific"})
+
+        assert debug["return_branch"] == "rejected_uncited_response"
+        assert debug["support_audit"] == {"total_claims": 0, "supported_claims": 0, "unsupported_claims": 1}
+        assert debug["pages_count"] == 8 and len(debug["pages_sample"]) <= 5
+        assert debug["markers_count"] == 1
+        assert debug["sources_count"] == 0 and debug["sources"] == []
+        assert debug["raw_response"] == "raw"
+        assert debug["query_type"] == "case_specific"
+
+    def test_defaults(self):
+        debug = _debug_envelope("exception", pages=None)
+        assert debug["pages_count"] == 0 and debug["pages_sample"] == []
+        assert debug["search_terms"] == [] and debug["raw_response"] is None
@@ -0,0 +1,109 @@
+"""
+Tests for the SQLite helpers in backend/database.py.
+
+Each thread keeps one open connection, so the tests point DB_PATH at a
+temporary file and reset the thread-local connection around every test.
+"""
+
+import sqlite3
+import threading
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import pytest
+
+from backend import database
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "cafc.db"))
+    monkeypatch.setattr(database, "_local", threading.local())
+    database.init_db()
+    database.upsert_opinion({"id": "op-1", "case_name": "A v. B", "appeal_no": "20-1",
+                             "release_date": "2021-01-01", "pdf_url": "https://example.com/a.pdf"})
+    yield database
+    conn = getattr(database._local, "conn", None)
+    if conn is not None:
+        conn.close()
+
+
+class TestConnectionReuse:
+    """Helpers on one thread share a WAL-mode connection."""
+
+    def test_same_thread_reuses_connection(self, sqlite_db):
+        with sqlite_db.get_db() as first, sqlite_db.get_db() as second:
+            assert first is second
+            assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_failed_write_is_rolled_back(self, sqlite_db):
+        with pytest.raises(RuntimeError):
+            with sqlite_db.get_db() as conn:
+                conn.execute("UPDATE opinions SET case_name = 'changed' WHERE id = 'op-1'")
+                raise RuntimeError("boom")
+
+        assert sqlite_db.get_opinion("op-1")["case_name"] == "A v. B"
+
+    def test_uncommitted_write_does_not_hold_the_lock(self, sqlite_db):
+        sqlite_db.check_fts_health()
+
+        with sqlite_db.get_db() as conn:
+            assert not conn.in_transaction
+
+        other = sqlite3.connect(sqlite_db.DB_PATH, timeout=0)
+        try:
+            other.execute("UPDATE opinions SET case_name = 'E v. F' WHERE id = 'op-1'")
+            other.commit()
+        finally:
+            other.close()
+
+
+class TestGetStatus:
+
+    def test_counts_total_and_ingested(self, sqlite_db):
+        sqlite_db.upsert_opinion({"id": "op-2", "case_name": "C v. D", "appeal_no": "20-2",
+                                  "release_date": "2021-02-01", "pdf_url": "https://example.com/c.pdf"})
+        sqlite_db.mark_opinion_ingested("op-2")
+
+        assert sqlite_db.get_status() == {"status": "ok", "opinions": {"total": 2, "ingested": 1}}
+
+    def test_empty_table(self, sqlite_db):
+        with sqlite_db.get_db() as conn:
+            conn.execute("DELETE FROM opinions")
+            conn.commit()
+
+        assert sqlite_db.get_status()["opinions"] == {"total": 0, "ingested": 0}
+
+
+class TestBulkInsertPages:
+
+    def test_pages_are_indexed_for_search(self, sqlite_db):
+        sqlite_db.bulk_insert_pages([
+            ("op-1", 1, "The claims are directed to an abstract idea."),
+            ("op-1", 2, "A reasonable royalty was awarded."),
+        ])
+        sqlite_db.mark_opinion_ingested("op-1")
+
+        assert [p["page_number"] for p in sqlite_db.get_pages_for_opinion("op-1")] == [1, 2]
+        assert [p["page_number"] for p in sqlite_db.search_pages("royalty")] == [2]
+
+
+class TestSearchPages:
+    """search_pages prefers pages with every term and falls back to any term."""
+
+    def _ingest(self, db, texts):
+        db.bulk_insert_pages([("op-1", n, text) for n, text in enumerate(texts, 1)])
+        db.mark_opinion_ingested("op-1")
+
+    def test_all_terms_preferred(self, sqlite_db):
+        self._ingest(sqlite_db, ["means plus function claim", "means for attaching", "function of the device"])
+        assert [p["page_number"] for p in sqlite_db.search_pages("means function")] == [1]
+
+    def test_falls_back_to_any_term(self, sqlite_db):
+        self._ingest(sqlite_db, ["means for attaching", "function of the device"])
+        assert sorted(p["page_number"] for p in sqlite_db.search_pages("means function")) == [1, 2]
+
+    def test_operator_words_are_terms(self, sqlite_db):
+        self._ingest(sqlite_db, ["NOT obvious AND novel"])
+        assert [p["page_number"] for p in sqlite_db.search_pages("NOT obvious AND")] == [1]